@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark merging the added attributes of an enum class into the items of its file.
+
+Compare the scan of the items for every attribute used before with the
+uid -> item index of :func:`docfx_yaml.extension.merge_added_attributes`.
+
+Usage: python benchmarks/bench_added_attributes.py [number of members]
+"""
+import os
+import sys
+import time
+from copy import deepcopy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docfx_yaml.extension import merge_added_attributes, _create_reference  # noqa
+from docfx_yaml.utils import ReferenceSet  # noqa
+
+
+def make_enum(count):
+    """
+    Make the items of an enum class file and the attributes of its docstring.
+    Every other member also has an item, as it's documented in the source file.
+    """
+    uid = 'pkg.module.BigEnum'
+    enum = {'uid': uid, 'type': 'class', 'children': [], 'references': ReferenceSet()}
+    yaml_data = [enum]
+    added_attribute = []
+    for index in range(count):
+        member_uid = '{}.VALUE{}'.format(uid, index)
+        attribute = {
+            'uid': member_uid,
+            'name': 'VALUE{}'.format(index),
+            'fullName': member_uid,
+            'parent': uid,
+            'type': 'attribute',
+            'syntax': {'content': 'VALUE{} = {}'.format(index, index)},
+        }
+        added_attribute.append(attribute)
+        if index % 2:
+            yaml_data.append({'uid': member_uid, 'type': 'attribute',
+                              'summary': 'Member {}'.format(index)})
+    return enum, added_attribute, yaml_data
+
+
+def merge_scanning(obj, added_attribute, yaml_data):
+    for attrData in added_attribute:
+        existed_Data = next((n for n in yaml_data if n['uid'] == attrData['uid']), None)
+        if existed_Data:
+            existed_Data.update(attrData)
+        else:
+            obj.get('children', []).append(attrData['uid'])
+            yaml_data.append(attrData)
+            obj['references'].append(_create_reference(attrData, attrData['parent']))
+
+
+def merge_indexed(obj, added_attribute, yaml_data):
+    items_by_uid = {}
+    for item in yaml_data:
+        items_by_uid.setdefault(item['uid'], item)
+    merge_added_attributes(obj, added_attribute, yaml_data, items_by_uid)
+
+
+def run(merge, count):
+    enum, added_attribute, yaml_data = deepcopy(make_enum(count))
+    start = time.perf_counter()
+    merge(enum, added_attribute, yaml_data)
+    elapsed = time.perf_counter() - start
+    enum['references'] = list(enum['references'])
+    return elapsed, yaml_data
+
+
+def main(count):
+    for size in (200, count):
+        scanning_time, scanned = run(merge_scanning, size)
+        indexed_time, indexed = run(merge_indexed, size)
+        assert scanned == indexed
+        print('{:>5} members: scanning {:.4f}s, indexed {:.4f}s'.format(
+            size, scanning_time, indexed_time))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark MarkdownTranslator on docstrings made of notes, tips and warnings holding
+references, rendering the alert boxes from their text in one walk, and walking their
+children, replacing their references and getting their text, as done before.
+
+Usage: python benchmarks/bench_alert_box.py [repeat]
+"""
+import sys
+import time
+
+from docutils.core import publish_doctree
+
+from fragments import collect_fragments
+
+from docfx_yaml.writer import MarkdownTranslator
+
+ALERT_BOXES = '''
+Get the client of the service.
+
+.. note::
+
+   The client is cached, see `Client <azure.core.html#azure.core.Client>`_
+   and the ``credential`` of `PipelineClient <azure.core.html#azure.core.PipelineClient>`_.
+
+   Second paragraph of the note, with *emphasis* and **strong** text.
+
+.. warning::
+
+   Don't share the client across processes, see https://docs.microsoft.com/python/api.
+
+.. tip::
+
+   - Use `ClientSecretCredential <azure.identity.html#azure.identity.ClientSecretCredential>`_.
+   - Or `DefaultAzureCredential <azure.identity.html#azure.identity.DefaultAzureCredential>`_.
+'''
+
+
+def depart_alert_box(name):
+    def depart(self, node):
+        self.clear_last_state()
+        MarkdownTranslator.resolve_reference_in_node(node)
+        lines = node.astext().split('\n')
+        quoteLines = ['> {0}\n>'.format(line) for line in lines]
+        self.add_text('\n> [!{0}]\n{1}'.format(name, '\n'.join(quoteLines)))
+    return depart
+
+
+class ThreeWalksTranslator(MarkdownTranslator):
+    """
+    The translator walking the children of the alert boxes, then their references and text.
+    """
+    visit_note = visit_tip = visit_warning = MarkdownTranslator._visit_admonition
+    depart_note = depart_alert_box('NOTE')
+    depart_tip = depart_alert_box('TIP')
+    depart_warning = depart_alert_box('WARNING')
+
+
+def run(translator_class, app, documents):
+    translator = translator_class(documents[0], app.builder)
+    results = []
+    start = time.perf_counter()
+    for document in documents:
+        translator.reset(document)
+        translator.walkabout(document)
+        results.append(translator.body)
+    return time.perf_counter() - start, results
+
+
+def main(repeat):
+    app, _ = collect_fragments()
+    settings = {'report_level': 5}
+
+    documents = [publish_doctree(ALERT_BOXES, settings_overrides=settings) for _ in range(repeat)]
+    old_time, old_results = run(ThreeWalksTranslator, app, documents)
+    documents = [publish_doctree(ALERT_BOXES, settings_overrides=settings) for _ in range(repeat)]
+    new_time, new_results = run(MarkdownTranslator, app, documents)
+    assert old_results == new_results
+
+    print('{} documents: walking alert boxes three times {:.3f}s ({:.2f}us per document)'.format(
+        repeat, old_time, old_time / repeat * 1e6))
+    print('{} documents: one walk {:.3f}s ({:.2f}us per document)'.format(
+        repeat, new_time, new_time / repeat * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
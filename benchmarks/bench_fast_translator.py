@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark MarkdownWriter on the fragments of the tests/example corpus, rendering the
+documents with FastTranslator when they only hold paragraphs, lists and inline markup,
+and with MarkdownTranslator walking all of them, as done before.
+
+Usage: python benchmarks/bench_fast_translator.py [repeat]
+"""
+import sys
+import time
+
+from fragments import collect_fragments
+
+from docfx_yaml.utils import _new_partial_document
+from docfx_yaml.writer import MarkdownWriter, MarkdownTranslator
+
+
+class FullTranslator(MarkdownTranslator):
+    """
+    MarkdownTranslator under another class, so that MarkdownWriter doesn't try FastTranslator.
+    """
+
+
+def run(translator_class, app, documents):
+    writer = MarkdownWriter(app.builder)
+    writer.translator_class = translator_class
+    start = time.perf_counter()
+    results = [writer.translate_document(document) for document in documents]
+    return time.perf_counter() - start, results
+
+
+def make_documents(fragments, repeat):
+    documents = []
+    for _ in range(repeat):
+        for node in fragments:
+            document = _new_partial_document()
+            document.append(node.deepcopy())
+            documents.append(document)
+    return documents
+
+
+def main(repeat):
+    app, fragments = collect_fragments()
+
+    full_time, full_results = run(FullTranslator, app, make_documents(fragments, repeat))
+    fast_time, fast_results = run(MarkdownTranslator, app, make_documents(fragments, repeat))
+    assert full_results == fast_results
+
+    writer = MarkdownWriter(app.builder)
+    fast = sum(
+        writer.fast_translator.translate(document) is not None
+        for document in make_documents(fragments, 1)
+    )
+    count = len(full_results)
+    print('{} documents, {:.0%} rendered by FastTranslator'.format(count, fast / len(fragments)))
+    print('{} documents: MarkdownTranslator {:.3f}s ({:.2f}us per document)'.format(
+        count, full_time, full_time / count * 1e6))
+    print('{} documents: FastTranslator and fallback {:.3f}s ({:.2f}us per document)'.format(
+        count, fast_time, fast_time / count * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
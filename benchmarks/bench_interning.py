@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the memory of the data read from the tests/example corpus once loaded back
+from pickles, as done for the environment and the data of parallel reading processes,
+with the strings of the records interned and without, as done before.
+
+Each document is pickled on its own, so strings repeated across documents are
+only shared when they are interned.
+
+Usage: python benchmarks/bench_interning.py [repeat]
+"""
+import sys
+import pickle
+import tracemalloc
+
+from fragments import collect_fragments
+
+from docfx_yaml import model
+from docfx_yaml.model import to_data
+
+
+def measure(pickles):
+    """
+    Get the memory taken by the data loaded from pickles.
+    """
+    tracemalloc.start()
+    loaded = [pickle.loads(data) for data in pickles]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, loaded
+
+
+def main(repeat):
+    app, _ = collect_fragments()
+    doc_data = app.env.docfx_doc_data
+    pickles = [
+        pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        for _ in range(repeat)
+        for data in doc_data.values()
+    ]
+    count = sum(len(data['objects']) for data in doc_data.values()) * repeat
+
+    interned = {cls: cls.interned for cls in model.Record.__subclasses__()}
+    for cls in interned:
+        cls.interned = frozenset()
+    try:
+        before_size, before = measure(pickles)
+    finally:
+        for cls, attributes in interned.items():
+            cls.interned = attributes
+    after_size, after = measure(pickles)
+    assert repr(to_data(before)) == repr(to_data(after))
+
+    print('{} objects: {:.2f}MB without interning'.format(count, before_size / 2 ** 20))
+    print('{} objects: {:.2f}MB with interning'.format(count, after_size / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the memory of the data read from the tests/example corpus,
+kept as the records of docfx_yaml.model and as the nested dicts used before,
+with the corpus repeated as many times as asked.
+
+Usage: python benchmarks/bench_item_model.py [repeat]
+"""
+import sys
+import pickle
+import tracemalloc
+from copy import deepcopy
+
+from fragments import collect_fragments
+
+from docfx_yaml.model import to_data
+
+
+def measure(make, repeat):
+    """
+    Get the memory taken by repeat copies of the data made by make, and their pickled size.
+    """
+    tracemalloc.start()
+    copies = [make() for _ in range(repeat)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, len(pickle.dumps(copies, pickle.HIGHEST_PROTOCOL))
+
+
+def main(repeat):
+    app, _ = collect_fragments()
+    doc_data = app.env.docfx_doc_data
+    as_dicts = to_data(doc_data)
+    assert repr(to_data(deepcopy(doc_data))) == repr(as_dicts)
+
+    # Strings are shared by the copies in both cases, only the containers are measured
+    records_size, records_pickle = measure(lambda: deepcopy(doc_data), repeat)
+    dicts_size, dicts_pickle = measure(lambda: deepcopy(as_dicts), repeat)
+
+    count = sum(len(data['objects']) for data in doc_data.values()) * repeat
+    print('{} objects: dicts {:.2f}MB in memory, {:.2f}MB pickled'.format(
+        count, dicts_size / 2 ** 20, dicts_pickle / 2 ** 20))
+    print('{} objects: records {:.2f}MB in memory, {:.2f}MB pickled'.format(
+        count, records_size / 2 ** 20, records_pickle / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark finding the friendly names of package names from the patterns of namespace_package_dict,
+calling ``re.match`` with each pattern in order as done before,
+and with :class:`docfx_yaml.settings.NamespacePackageMatcher`.
+
+Usage: python benchmarks/bench_namespace_packages.py [patterns] [package names] [lookups]
+"""
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docfx_yaml.settings import NamespacePackageMatcher  # noqa
+
+
+def match_each(namespace_package_dict, package_name):
+    for name in namespace_package_dict:
+        if re.match(name, package_name) is not None:
+            return namespace_package_dict[name]
+    return None
+
+
+def main(pattern_count, name_count, lookups):
+    rng = random.Random(0)
+    namespace_package_dict = {
+        r'\.?company_{}_[a-z]+'.format(index): 'friendly_{}'.format(index)
+        for index in range(pattern_count)
+    }
+    package_names = [
+        'company_{}_{}'.format(rng.randrange(pattern_count * 2), rng.choice(['core', 'ext', 'io']))
+        for _ in range(name_count)
+    ]
+    lookup_names = [rng.choice(package_names) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    expected = [match_each(namespace_package_dict, name) for name in lookup_names]
+    each_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = NamespacePackageMatcher(namespace_package_dict)
+    matched = [matcher.match(name) for name in lookup_names]
+    matcher_time = time.perf_counter() - start
+
+    assert matched == expected
+    print('{} patterns, {} lookups over {} package names: re.match with each pattern {:.3f}s, '
+          'NamespacePackageMatcher {:.3f}s'.format(
+              pattern_count, lookups, name_count, each_time, matcher_time))
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [500, 600, 2000][len(args):]))
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the memory used to output the YAML files of the tests/example corpus,
+keeping the data in ``app.env`` until the end as done before, and freeing it as it is
+written with ``docfx_yaml_release_data``.
+
+The memory measured depends on the allocator and the Python version,
+so it is compared here rather than in the tests.
+
+Usage: python benchmarks/bench_release_data.py
+"""
+import os
+import gc
+import shutil
+import tracemalloc
+from copy import deepcopy
+
+from fragments import collect_fragments
+
+from docfx_yaml.extension import build_finished, MANIFEST_FILENAME
+
+
+def measure(app, doc_data, release_data):
+    """
+    Get the memory left once the files are output and its peak while outputting them.
+    """
+    app.env.docfx_doc_data = deepcopy(doc_data)
+    app.config.docfx_yaml_release_data = release_data
+    # Dump every file, as in a first build
+    manifest_file = os.path.join(app.doctreedir, MANIFEST_FILENAME)
+    if os.path.exists(manifest_file):
+        os.remove(manifest_file)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        build_finished(app, None)
+        gc.collect()
+        return tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    app, _ = collect_fragments()
+    doc_data = deepcopy(app.env.docfx_doc_data)
+
+    try:
+        measure(app, doc_data, False)  # Warm up the caches of the first output
+        kept, kept_peak = measure(app, doc_data, False)
+        released, released_peak = measure(app, doc_data, True)
+    finally:
+        # The build directory of collect_fragments, written again by build_finished
+        shutil.rmtree(os.path.dirname(app.outdir))
+
+    print('data kept: {:.0f}KiB left, {:.0f}KiB peak'.format(kept / 1024, kept_peak / 1024))
+    print('data released: {:.0f}KiB left, {:.0f}KiB peak'.format(
+        released / 1024, released_peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
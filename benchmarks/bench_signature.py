@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark finding the signatures of pybind11 docstrings, compiling the regex
+for every docstring as done before, with the compiled regex and with the parser
+used by :func:`docfx_yaml.extension.enumerate_cleaned_signature`.
+
+Usage: python benchmarks/bench_signature.py [number of docstrings]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docfx_yaml import extension  # noqa
+from docfx_yaml.extension import enumerate_extract_signature, enumerate_cleaned_signature  # noqa
+
+
+def make_docstring(index):
+    """
+    Make the docstring of an overloaded pybind11 method with a long description.
+    """
+    args = ', '.join(
+        '{0}: {1} = {2}'.format('x_' + 'abcdefghijkl'[i], ('numpy.float', 'int')[i % 2], i)
+        for i in range(index % 12))
+    overloads = '\n\n'.join(
+        '{0}. compute(self: native.Solver, {1}) -> None\n\n'
+        'Compute the solution of the system (see solve(self) and reset(self: native.Solver)), '
+        'the tolerance of the solver is used for every step.'.format(overload, args)
+        for overload in range(1, 4))
+    return ('compute(*args, **kwargs)\nOverloaded function.\n\n' + overloads + '\n'
+            + 'Details: ' * 200)
+
+
+def cleaned_with_regex(doc, max_args=20):
+    for sig in enumerate_extract_signature(doc, max_args=max_args):
+        dic = sig.groupdict()
+        args = []
+        for i in range(0, max_args):
+            p = dic.get('p%d' % i, None)
+            if p is None:
+                break
+            d = dic.get('d%d' % i, None)
+            args.append(p if d is None else "%s%s" % (p, d))
+        yield "{0}({1})".format(sig["name"], ", ".join(args))
+
+
+def run(enumerate_signatures, docstrings, clear_regex=False):
+    start = time.perf_counter()
+    results = []
+    for doc in docstrings:
+        if clear_regex:
+            extension._signature_regex.cache_clear()
+        results.append(list(enumerate_signatures(doc)))
+    return time.perf_counter() - start, results
+
+
+def main(count):
+    docstrings = [make_docstring(i) for i in range(count)]
+
+    uncompiled_time, uncompiled = run(cleaned_with_regex, docstrings, clear_regex=True)
+    compiled_time, compiled = run(cleaned_with_regex, docstrings)
+    parser_time, parsed = run(enumerate_cleaned_signature, docstrings)
+    assert uncompiled == compiled == parsed
+
+    print('{} docstrings: regex compiled each time {:.3f}s, compiled once {:.3f}s, '
+          'parser {:.3f}s'.format(count, uncompiled_time, compiled_time, parser_time))
+
+    # The regex backtracks exponentially on argument lists that aren't closed
+    for args in (4, 6, 8):
+        docstrings = ['compute(' + ','.join(['x=y'] * args) + ' ...']
+        regex_time, regex_result = run(cleaned_with_regex, docstrings)
+        parser_time, parsed = run(enumerate_cleaned_signature, docstrings)
+        assert regex_result == parsed
+        print('unclosed list of {} arguments: regex {:.4f}s, parser {:.4f}s'.format(
+            args, regex_time, parser_time))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
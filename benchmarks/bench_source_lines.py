@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark finding the start line of the classes, functions and methods of some packages,
+with ``inspect.getsourcelines`` as done before and with :class:`docfx_yaml.source.SourceLines`.
+
+Usage: python benchmarks/bench_source_lines.py [package ...]
+"""
+import os
+import sys
+import time
+import inspect
+import pkgutil
+import importlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docfx_yaml.source import SourceLines  # noqa
+
+
+def collect_objects(package_names):
+    """
+    Get the modules of the packages, and the classes, functions and methods defined in them.
+    """
+    objects = []
+    for package_name in package_names:
+        package = importlib.import_module(package_name)
+        modules = [package]
+        for info in pkgutil.walk_packages(getattr(package, '__path__', []), package_name + '.'):
+            try:
+                modules.append(importlib.import_module(info.name))
+            except Exception:
+                pass
+
+        for module in modules:
+            objects.append(module)
+            for value in vars(module).values():
+                if getattr(value, '__module__', None) != module.__name__:
+                    continue
+                if inspect.isclass(value):
+                    objects.append(value)
+                    objects.extend(v for v in vars(value).values() if inspect.isfunction(v))
+                elif inspect.isfunction(value):
+                    objects.append(value)
+    return objects
+
+
+def start_lines(get_start_line, objects):
+    start = time.perf_counter()
+    lines = []
+    for obj in objects:
+        try:
+            lines.append(get_start_line(obj))
+        except (TypeError, OSError):
+            lines.append(None)
+    return time.perf_counter() - start, lines
+
+
+def main(package_names):
+    objects = collect_objects(package_names)
+
+    inspect_time, inspect_lines = start_lines(lambda obj: inspect.getsourcelines(obj)[1], objects)
+    index_time, index_lines = start_lines(SourceLines().start_line, objects)
+    assert inspect_lines == index_lines
+
+    print('{} objects: inspect {:.3f}s, source lines {:.3f}s'.format(
+        len(objects), inspect_time, index_time))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or ['json', 'email', 'docutils', 'yaml', 'jinja2', 'logging'])
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark writer.TextWrapper on long English paragraphs and localized docstrings,
+against the former wrapper measuring every chunk and character with docutils'
+column_width, and check both break the lines at the same places.
+
+Usage: python benchmarks/bench_text_wrapper.py [repeat]
+"""
+import os
+import sys
+import time
+import random
+import textwrap
+from itertools import groupby
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docutils.utils import column_width  # noqa
+
+from docfx_yaml.writer import TextWrapper, MAXWIDTH  # noqa
+
+
+class ColumnWidthTextWrapper(TextWrapper):
+    """
+    The former wrapper, calling column_width on every chunk and character.
+    """
+
+    def _wrap_chunks(self, chunks):
+        drop_whitespace = getattr(self, 'drop_whitespace', True)
+        lines = []
+        if self.width <= 0:
+            raise ValueError("invalid width %r (must be > 0)" % self.width)
+
+        chunks.reverse()
+
+        while chunks:
+            cur_line = []
+            cur_len = 0
+
+            if lines:
+                indent = self.subsequent_indent
+            else:
+                indent = self.initial_indent
+
+            width = self.width - column_width(indent)
+
+            if drop_whitespace and chunks[-1].strip() == '' and lines:
+                del chunks[-1]
+
+            while chunks:
+                chunk_width = column_width(chunks[-1])
+
+                if cur_len + chunk_width <= width:
+                    cur_line.append(chunks.pop())
+                    cur_len += chunk_width
+
+                else:
+                    break
+
+            if chunks and column_width(chunks[-1]) > width:
+                self._handle_long_word(chunks, cur_line, cur_len, width)
+
+            if drop_whitespace and cur_line and cur_line[-1].strip() == '':
+                del cur_line[-1]
+
+            if cur_line:
+                lines.append(indent + ''.join(cur_line))
+
+        return lines
+
+    def _break_word(self, word, space_left):
+        total = 0
+        for i, c in enumerate(word):
+            total += column_width(c)
+            if total > space_left:
+                return word[:i-1], word[i-1:]
+        return word, ''
+
+    def _split(self, text):
+        def split(t):
+            return textwrap.TextWrapper._split(self, t)
+        chunks = []
+        for chunk in split(text):
+            for w, g in groupby(chunk, column_width):
+                if w == 1:
+                    chunks.extend(split(''.join(g)))
+                else:
+                    chunks.extend(list(g))
+        return chunks
+
+
+ENGLISH_WORDS = (
+    'the', 'client', 'credential', 'is', 'used', 'to', 'authenticate', 'requests', 'of',
+    'a', 'long-running', 'operation', 'poller', ':class:`~azure.core.Poller`', 'returns',
+    'an', 'iterator', '--', 'see', 'https://docs.microsoft.com/python/api/overview/azure',
+    'optional', '``None``', 'keyword-only', 'arguments', 'e.g.', '(default:', '30)',
+    'maximum_concurrent_connections_per_host_pool',
+)
+LOCALIZED_WORDS = (
+    '客户端', '凭据', '用于', '对请求进行身份验证。', '長時間実行される', '操作の', 'ポーラー',
+    '를', '반환합니다', '（既定值：', '30）', 'ＡＢＣ', 'café', 'résumé', 'é',
+    'client', 'credential', ':class:`~azure.core.Poller`', '--',
+)
+
+
+def make_paragraph(rng, words, count):
+    return ' '.join(rng.choice(words) for _ in range(count))
+
+
+def run(wrapper_class, paragraphs, width):
+    wrapper = wrapper_class(width=width)
+    start = time.perf_counter()
+    lines = [wrapper.wrap(paragraph) for paragraph in paragraphs]
+    return time.perf_counter() - start, lines
+
+
+def main(repeat):
+    rng = random.Random(0)
+    corpora = {
+        'english': [make_paragraph(rng, ENGLISH_WORDS, 400) for _ in range(repeat)],
+        'localized': [make_paragraph(rng, LOCALIZED_WORDS, 400) for _ in range(repeat)],
+    }
+    for name, paragraphs in sorted(corpora.items()):
+        for width in (MAXWIDTH, 79, 20):
+            old_time, old_lines = run(ColumnWidthTextWrapper, paragraphs, width)
+            new_time, new_lines = run(TextWrapper, paragraphs, width)
+            assert old_lines == new_lines
+            print('{} paragraphs, width {}: column_width {:.3f}s, TextWrapper {:.3f}s'.format(
+                name, width, old_time, new_time))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
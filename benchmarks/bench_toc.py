@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark nested TOC construction on a synthetic tree of uids.
+
+Compare the recursive search for the parent node used before with the
+uid -> node lookup of :func:`docfx_yaml.extension.add_toc_node`.
+
+Usage: python benchmarks/bench_toc.py [number of uids]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docfx_yaml.extension import add_toc_node  # noqa
+
+
+def make_uids(count):
+    """
+    Make uids of packages, modules and classes in the order build_finished outputs them:
+    modules first, then classes, each sorted.
+    """
+    modules = []
+    classes = []
+    package = 0
+    while len(modules) + len(classes) < count:
+        package_name = 'pkg{}'.format(package)
+        modules.append(package_name)
+        for module in range(10):
+            module_name = '{}.mod{}'.format(package_name, module)
+            modules.append(module_name)
+            for cls in range(9):
+                classes.append('{}.Class{}'.format(module_name, cls))
+        package += 1
+    return (sorted(modules) + sorted(classes))[:count]
+
+
+def find_node_in_toc_tree(toc_yaml, to_add_node):
+    for module in toc_yaml:
+        if module['name'] == to_add_node:
+            return module
+
+        if 'items' in module:
+            items = module['items']
+            found_module = find_node_in_toc_tree(items, to_add_node)
+            if found_module is not None:
+                return found_module
+
+    return None
+
+
+def build_toc_recursive(uids):
+    toc_yaml = []
+    for uid in uids:
+        if uid.count('.') >= 1:
+            parent_level = '.'.join(uid.split('.')[:-1])
+            found_node = find_node_in_toc_tree(toc_yaml, parent_level)
+
+            if found_node:
+                found_node.pop('uid', 'No uid found')
+                found_node.setdefault('items', [{'name': 'Overview', 'uid': parent_level}]).append(
+                    {'name': uid, 'uid': uid})
+            else:
+                toc_yaml.append({'name': uid, 'uid': uid})
+
+        else:
+            toc_yaml.append({'name': uid, 'uid': uid})
+    return toc_yaml
+
+
+def build_toc_indexed(uids):
+    toc_yaml = []
+    toc_nodes = {}
+    for uid in uids:
+        add_toc_node(toc_yaml, toc_nodes, uid)
+    return toc_yaml
+
+
+def main(count):
+    # The recursive search is quadratic, only run it on the smaller trees
+    for size in (1000, 5000, count):
+        uids = make_uids(size)
+        indexed = min(timeit.repeat(lambda: build_toc_indexed(uids), number=1, repeat=3))
+        if size <= 5000:
+            recursive = min(timeit.repeat(lambda: build_toc_recursive(uids), number=1, repeat=3))
+            assert build_toc_recursive(uids) == build_toc_indexed(uids)
+            print('{:>6} uids: recursive {:.4f}s, indexed {:.4f}s'.format(size, recursive, indexed))
+        else:
+            print('{:>6} uids: indexed {:.4f}s'.format(size, indexed))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
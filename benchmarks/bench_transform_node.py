@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark utils.transform_node on the fragments of the tests/example corpus.
+
+Compare a writer, translator and document settings made for every fragment,
+as done before, with the cached settings and reused writers of transform_node.
+
+Usage: python benchmarks/bench_transform_node.py [repeat]
+"""
+import sys
+import time
+
+from docutils.io import StringOutput
+from docutils.utils import new_document
+
+from fragments import collect_fragments, copies
+
+from docfx_yaml.utils import transform_node
+from docfx_yaml.writer import MarkdownWriter
+
+
+def transform_node_uncached(app, node):
+    destination = StringOutput(encoding='utf-8')
+    doc = new_document(b'<partial node>')
+    doc.append(node)
+
+    # Resolve refs
+    doc['docname'] = 'inmemory'
+    app.env.resolve_references(doctree=doc, fromdocname='inmemory', builder=app.builder)
+
+    writer = MarkdownWriter(app.builder)
+    writer.write(doc, destination)
+    return destination.destination.decode('utf-8')
+
+
+def run(app, transform, fragment_copies):
+    start = time.perf_counter()
+    results = [transform(app, node) for nodes in fragment_copies for node in nodes]
+    return time.perf_counter() - start, results
+
+
+def main(repeat):
+    app, fragments = collect_fragments()
+
+    uncached_time, uncached = run(app, transform_node_uncached, copies(fragments, repeat))
+    cached_time, cached = run(app, transform_node, copies(fragments, repeat))
+    assert uncached == cached
+
+    count = len(fragments) * repeat
+    print('{} fragments: uncached {:.3f}s ({:.1f}us each), cached {:.3f}s ({:.1f}us each)'.format(
+        count, uncached_time, uncached_time / count * 1e6, cached_time, cached_time / count * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark MarkdownTranslator on the fragments of the tests/example corpus, walking them
+with its dispatch table and stack, and with docutils' recursive walkabout looking up the
+visitor methods of every node by name, as done before.
+
+Usage: python benchmarks/bench_translator_dispatch.py [repeat]
+"""
+import sys
+import time
+
+from docutils import nodes
+
+from fragments import collect_fragments
+
+from docfx_yaml.utils import _new_partial_document
+from docfx_yaml.writer import MarkdownTranslator
+
+
+class GetattrTranslator(MarkdownTranslator):
+    """
+    The translator walked by Node.walkabout, with NodeVisitor's dispatch.
+    """
+    dispatch_visit = nodes.NodeVisitor.dispatch_visit
+    dispatch_departure = nodes.NodeVisitor.dispatch_departure
+
+    def walkabout(self, node):
+        return node.walkabout(self)
+
+
+def run(translator_class, app, documents):
+    translator = translator_class(documents[0], app.builder)
+    results = []
+    start = time.perf_counter()
+    for document in documents:
+        translator.reset(document)
+        translator.walkabout(document)
+        results.append(translator.body)
+    return time.perf_counter() - start, results
+
+
+def main(repeat):
+    app, fragments = collect_fragments()
+    documents = []
+    for _ in range(repeat):
+        for node in fragments:
+            document = _new_partial_document()
+            document.append(node.deepcopy())
+            documents.append(document)
+    count = sum(len(document.traverse()) for document in documents)
+
+    getattr_time, getattr_results = run(GetattrTranslator, app, documents)
+    table_time, table_results = run(MarkdownTranslator, app, documents)
+    assert getattr_results == table_results
+    print('{} documents, {} nodes: walkabout {:.3f}s ({:.2f}us per node)'.format(
+        len(documents), count, getattr_time, getattr_time / count * 1e6))
+    print('{} documents, {} nodes: dispatch table {:.3f}s ({:.2f}us per node)'.format(
+        len(documents), count, table_time, table_time / count * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark writing a big YAML file: dumping the whole file at once as done before,
+calling yaml.dump for each item, and emitting each item with a single dumper
+as :func:`docfx_yaml.serializer.dump_items` does.
+
+Usage: python benchmarks/bench_yaml_stream.py [number of items] [serializer]
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docfx_yaml.serializer import dump, dump_items, resolve_serializer, AUTO  # noqa
+
+
+def make_module(count):
+    """
+    Make the data of a module file with count functions.
+    """
+    items = []
+    references = []
+    for index in range(count):
+        uid = 'pkg.module.function_{}'.format(index)
+        items.append({
+            'uid': uid,
+            'name': 'function_{}'.format(index),
+            'fullName': uid,
+            'type': 'function',
+            'langs': ['python'],
+            'summary': 'Summary of function {} with a long enough description. '.format(index) * 4,
+            'syntax': {
+                'content': 'function_{}(credential, **kwargs)'.format(index),
+                'parameters': [
+                    {'id': 'credential', 'description': 'The credential used to authenticate',
+                     'type': ['str']},
+                    {'id': 'kwargs', 'description': 'Optional keyword arguments',
+                     'isRequired': False},
+                ],
+            },
+            'source': {'id': 'function_{}'.format(index), 'path': 'pkg/module.py',
+                       'startLine': index * 10},
+        })
+        references.append({'uid': uid, 'name': 'function_{}'.format(index), 'fullName': uid,
+                           'parent': 'pkg.module', 'isExternal': False})
+    return {'items': items, 'references': references, 'api_name': []}
+
+
+def dump_each_item(data, stream, serializer):
+    """
+    Dump data like dump_items, with a yaml.dump call and its dumper for each item.
+    """
+    for key in sorted(data):
+        value = data[key]
+        if isinstance(value, list) and value:
+            # The first item is dumped with the key, the others follow it
+            dump({key: value[:1]}, stream, serializer=serializer)
+            for item in value[1:]:
+                dump([item], stream, serializer=serializer)
+        else:
+            dump({key: value}, stream, serializer=serializer)
+
+
+def measure(dump_data, data, serializer):
+    stream = io.StringIO()
+    tracemalloc.start()
+    start = time.perf_counter()
+    dump_data(data, stream, serializer=serializer)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, stream.getvalue()
+
+
+def main(count, serializer):
+    data = make_module(count)
+    results = [
+        ('whole file', measure(dump, data, serializer)),
+        ('yaml.dump by item', measure(dump_each_item, data, serializer)),
+        ('one dumper by item', measure(dump_items, data, serializer)),
+    ]
+    output = results[0][1][2]
+    assert all(result[2] == output for _, result in results)
+
+    print('{} items, {:.1f} MB of YAML with {}'.format(count, len(output) / 1e6, serializer))
+    for name, (elapsed, peak, _) in results:
+        print('{}: peak {:.1f} MB over the output, {:.2f}s'.format(
+            name, (peak - len(output)) / 1e6, elapsed))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         resolve_serializer(sys.argv[2] if len(sys.argv) > 2 else AUTO))
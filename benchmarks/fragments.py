@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Collect the docstring fragments transformed while building the tests/example project,
+so that transformations can be benchmarked on real nodes without running Sphinx.
+"""
+import os
+import sys
+import shutil
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sphinx.application import Sphinx  # noqa
+
+from docfx_yaml import utils, extension, monkeypatch  # noqa
+
+EXAMPLE_DOC = os.path.join(ROOT, 'tests', 'example', 'doc')
+
+
+def collect_fragments():
+    """
+    Build tests/example and return the Sphinx app and a copy of every node given to transform_node.
+    """
+    fragments = []
+    transform_node = utils.transform_node
+
+    def recording_transform_node(app, node):
+        fragments.append(node.deepcopy())
+        return transform_node(app, node)
+
+    build_dir = tempfile.mkdtemp()
+    utils.transform_node = extension.transform_node = monkeypatch._transform_node = \
+        recording_transform_node
+    try:
+        app = Sphinx(
+            srcdir=EXAMPLE_DOC,
+            confdir=EXAMPLE_DOC,
+            outdir=os.path.join(build_dir, 'html'),
+            doctreedir=os.path.join(build_dir, 'doctrees'),
+            buildername='html',
+            status=None,
+            warning=None,
+        )
+        app.build(force_all=True)
+    finally:
+        utils.transform_node = extension.transform_node = monkeypatch._transform_node = \
+            transform_node
+        shutil.rmtree(build_dir)
+
+    return app, fragments
+
+
+def copies(fragments, count):
+    """
+    Make count copies of the fragments, as transforming a node modifies it.
+    """
+    return [[node.deepcopy() for node in fragments] for _ in range(count)]
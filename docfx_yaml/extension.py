@@ -7,45 +7,28 @@ This extension allows you to automagically generate DocFX YAML from your Python
 import os
 import inspect
 import re
-from functools import partial
+import json
+from functools import partial, lru_cache
 from itertools import zip_longest
-
-try:
-    from subprocess import getoutput
-except ImportError:
-    from commands import getoutput
-
-from yaml import safe_dump as dump
+from collections import Counter
 
 from sphinx.util.console import darkgreen, bold
 from sphinx.util import ensuredir
 from sphinx.errors import ExtensionError
 from sphinx.util.nodes import make_refnode
 
-from .utils import transform_node, transform_string
-from .settings import API_ROOT
+from .utils import transform_node, transform_string, get_doc_data, ReferenceSet
+from .model import Item, Parameter, Source, to_data
+from .settings import API_ROOT, resolve_settings
+from .serializer import resolve_serializer, YamlFileWriter, FileHashes, PYTHON
 from .monkeypatch import patch_docfields
+from .signature import parse_signatures
+from .git import GitMetadata, get_git_metadata
+from .source import SourceLines
 from .directives import RemarksDirective, TodoDirective
 from .nodes import remarks
 
 
-class Bcolors:
-    HEADER = '\033[95m'
-    OKBLUE = '\033[94m'
-    OKGREEN = '\033[92m'
-    WARNING = '\033[93m'
-    FAIL = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
-
-
-try:
-    from conf import *
-except ImportError:
-    print(Bcolors.FAIL + 'can not import conf.py! '
-    'you should have a conf.py in working project folder' + Bcolors.ENDC)
-
 METHOD = 'method'
 FUNCTION = 'function'
 MODULE = 'module'
@@ -56,6 +39,7 @@ REFMETHOD = 'meth'
 REFFUNCTION = 'func'
 INITPY = '__init__.py'
 REF_PATTERN = ':(py:)?(func|class|meth|mod|ref):`~?[a-zA-Z_\.<> ]*?`'
+MANIFEST_FILENAME = 'docfx_yaml_manifest.json'
 
 
 def build_init(app):
@@ -65,39 +49,55 @@ def build_init(app):
     if not app.config.docfx_yaml_output:
         raise ExtensionError('You must configure an docfx_yaml_output setting')
 
+    # This stores the data read from each document, keyed by docname.
+    # It is kept in the pickled environment for incremental builds.
+    if not hasattr(app.env, 'docfx_doc_data'):
+        app.env.docfx_doc_data = {}
+
+    # The stores below are rebuilt from docfx_doc_data once reading is done
     # This stores YAML object for modules
     app.env.docfx_yaml_modules = {}
+    # This stores the module YAML object of each module name
+    app.env.docfx_module_datams = {}
+    # This stores the names of the direct submodules of each module
+    app.env.docfx_module_children = {}
     # This stores YAML object for classes
     app.env.docfx_yaml_classes = {}
     # This stores YAML object for functions
     app.env.docfx_yaml_functions = {}
     # This store the data extracted from the info fields
     app.env.docfx_info_field_data = {}
-    # This stores signature for functions and methods
-    app.env.docfx_signature_funcs_methods = {}
     # This store the uid-type mapping info
     app.env.docfx_info_uid_types = {}
 
-    remote = getoutput('git remote -v')
-
-    try:
-        app.env.docfx_remote = remote.split('\t')[1].split(' ')[0]
-    except Exception:
-        app.env.docfx_remote = None
-    try:
-        app.env.docfx_branch = getoutput('git rev-parse --abbrev-ref HEAD').strip()
-    except Exception:
-        app.env.docfx_branch = None
+    overrides = GitMetadata(
+        remote=app.config.docfx_yaml_git_remote,
+        branch=app.config.docfx_yaml_git_branch,
+        root=app.config.docfx_yaml_git_root,
+    )
+    if None in overrides:
+        # Kept in the pickled environment, until HEAD or the git config changes
+        app.env.docfx_git_metadata = get_git_metadata(
+            os.getcwd(), getattr(app.env, 'docfx_git_metadata', None))
+        metadata = app.env.docfx_git_metadata[1]
+    else:
+        metadata = overrides
 
-    try:
-        app.env.docfx_root = getoutput('git rev-parse --show-toplevel').strip()
-    except Exception:
-        app.env.docfx_root = None
+    app.env.docfx_remote = metadata.remote if overrides.remote is None else overrides.remote
+    app.env.docfx_branch = metadata.branch if overrides.branch is None else overrides.branch
+    app.env.docfx_root = metadata.root if overrides.root is None else overrides.root
 
     patch_docfields(app)
 
+    app.docfx_yaml_serializer = resolve_serializer(app.config.docfx_yaml_serializer)
     app.docfx_transform_node = partial(transform_node, app)
+    # Idle writers of transform_node, see utils._acquire_writer
+    app.docfx_writer_pool = []
     app.docfx_transform_string = partial(transform_string, app)
+    app.docfx_settings = resolve_settings(app.config)
+    # Source file path -> path in the YAML files, see _get_source_path
+    app.docfx_source_paths = {}
+    app.docfx_source_lines = SourceLines()
 
 
 def _get_cls_module(_type, name):
@@ -186,55 +186,41 @@ def _resolve_reference_in_module_summary(lines):
     return new_lines
 
 
-def enumerate_extract_signature(doc, max_args=20):
+@lru_cache()
+def _signature_regex(max_args):
     el = "((?P<p%d>[*a-zA-Z_]+) *(?P<a%d>: *[a-zA-Z_.]+)? *(?P<d%d>= *[^ ]+?)?)"
     els = [el % (i, i, i) for i in range(0, max_args)]
     par = els[0] + "?" + "".join(["( *, *" + e + ")?" for e in els[1:]])
     exp = "(?P<name>[a-zA-Z_]+) *[(] *(?P<sig>{0}) *[)]".format(par)
-    reg = re.compile(exp)
+    return re.compile(exp)
+
+
+def enumerate_extract_signature(doc, max_args=20):
+    reg = _signature_regex(max_args)
     for func in reg.finditer(doc.replace("\n", " ")):
         yield func
 
 
 def enumerate_cleaned_signature(doc, max_args=20):
-    for sig in enumerate_extract_signature(doc, max_args=max_args):
-        dic = sig.groupdict()
-        name = sig["name"]
-        args = []
-        for i in range(0, max_args):
-            p = dic.get('p%d' % i, None)
-            if p is None:
-                break
-            d = dic.get('d%d' % i, None)
-            if d is None:
-                args.append(p)
-            else:
-                args.append("%s%s" % (p, d))
+    # Same signatures as enumerate_extract_signature, without its backtracking
+    for name, args in parse_signatures(doc, max_args=max_args):
         yield "{0}({1})".format(name, ", ".join(args))
 
 
 def _extract_signature(obj_sig):
-    try:    
+    try:
         signature = inspect.signature(obj_sig)
         parameters = signature.parameters
-    except TypeError as e:
-        mes = "[docfx] unable to get signature of '{0}' - {1}.".format(
-            object_name, str(e).replace("\n", "\\n"))
+    except TypeError:
         signature = None
         parameters = None
-    except ValueError as e:
+    except ValueError:
         # Backup plan, no __text_signature__, this happen
         # when a function was created with pybind11.
         doc = obj_sig.__doc__
         sigs = set(enumerate_cleaned_signature(doc))
-        if len(sigs) == 0:
-            mes = "[docfx] unable to get signature of '{0}' - {1}.".format(
-                object_name, str(e).replace("\n", "\\n"))
-            signature = None
-            parameters = None
-        elif len(sigs) > 1:
-            mes = "[docfx] too many signatures for '{0}' - {1} - {2}.".format(
-                object_name, str(e).replace("\n", "\\n"), " *** ".join(sigs))
+        if len(sigs) != 1:
+            # No signature or too many of them
             signature = None
             parameters = None
         else:
@@ -242,36 +228,61 @@ def _extract_signature(obj_sig):
                 signature = inspect._signature_fromstr(
                     inspect.Signature, obj_sig, list(sigs)[0])
                 parameters = signature.parameters
-            except TypeError as e:
-                mes = "[docfx] unable to get signature of '{0}' - {1}.".format(
-                    object_name, str(e).replace("\n", "\\n"))
+            except TypeError:
                 signature = None
-                parameters = None    
+                parameters = None
     return signature, parameters
 
 
-def _create_datam(app, cls, module, name, _type, obj, lines=None):
+def _update_friendly_package_name(app, path):
+    package_name_index = path.find(os.sep)
+    package_name = path[:package_name_index]
+    if len(package_name) > 0 and app.docfx_settings.namespace_packages is not None:
+        friendly_name = app.docfx_settings.namespace_packages.match(package_name)
+        if friendly_name is not None:
+            path = os.path.join(friendly_name, path[package_name_index + 1:])
+
+    return path
+
+
+def _get_source_path(app, full_path):
     """
-    Build the data structure for an autodoc class
+    Get the path of a source file as shown in the YAML files,
+    computed once per file and kept in app.docfx_source_paths.
     """
+    if full_path in app.docfx_source_paths:
+        return app.docfx_source_paths[full_path]
 
-    def _update_friendly_package_name(path):
-        package_name_index = path.find(os.sep)
-        package_name = path[:package_name_index]
-        if len(package_name) > 0:
-            try:
-                for name in namespace_package_dict:
-                    if re.match(name, package_name) is not None:
-                        package_name = namespace_package_dict[name]
-                        path = os.path.join(package_name, path[package_name_index + 1:])
-                        return path
+    # Before Python 3.11, modules found from the '.' entry of sys.path
+    # have absolute paths holding a '.' folder
+    path = os.path.normpath(full_path) if os.path.isabs(full_path) else full_path
+    # Sub git repo path
+    path = path.replace(app.env.docfx_root, '') if app.env.docfx_root else path
+    # Support global file imports, if it's installed already
+    import_path = os.path.dirname(inspect.getfile(os))
+    path = path.replace(os.path.join(import_path, 'site-packages'), '')
+    path = path.replace(import_path, '')
+
+    # Make relative
+    path = path.replace(os.sep, '', 1)
+
+    path = _update_friendly_package_name(app, path)
+
+    # Get folder name from conf.py
+    path = os.path.join(app.config.folder, path)
 
-            except NameError:
-                pass
+    # append relative path defined in conf.py (in case of "binding python" project)
+    path = app.docfx_settings.source_prefix + path
 
-        return path
+    app.docfx_source_paths[full_path] = path
+    return path
 
 
+def _create_datam(app, cls, module, name, _type, obj, lines=None):
+    """
+    Build the data structure for an autodoc class
+    """
+
     if lines is None:
         lines = []
     short_name = name.split('.')[-1]
@@ -280,7 +291,7 @@ def _create_datam(app, cls, module, name, _type, obj, lines=None):
         if _type in [METHOD, FUNCTION]:
             argspec = inspect.getfullargspec(obj) # noqa
             for arg in argspec.args:
-                args.append({'id': arg})
+                args.append(Parameter(id=arg))
             if argspec.defaults:
                 for count, default in enumerate(argspec.defaults):
                     cut_count = len(argspec.defaults)
@@ -288,12 +299,13 @@ def _create_datam(app, cls, module, name, _type, obj, lines=None):
                     # inspect.getargspec method will return wrong defaults which contain object address for some default values, like sys.stdout
                     # Match the defaults with the count
                     if 'object at 0x' not in str(default):
-                        args[len(args) - cut_count + count]['defaultValue'] = str(default)
+                        args[len(args) - cut_count + count].default_value = str(default)
     except Exception as e:
         print("Can't get argspec for {}: {}. Exception: {}".format(type(obj), name, e))
 
-    if name in app.env.docfx_signature_funcs_methods:
-        sig = app.env.docfx_signature_funcs_methods[name]
+    signatures = get_doc_data(app.env)['signatures']
+    if name in signatures:
+        sig = signatures[name]
     else:
         sig = None
 
@@ -301,74 +313,48 @@ def _create_datam(app, cls, module, name, _type, obj, lines=None):
         full_path = inspect.getsourcefile(obj)
         if full_path is None: # Meet a .pyd file
             raise TypeError()
-        # Sub git repo path
-        path = full_path.replace(app.env.docfx_root, '')
-        # Support global file imports, if it's installed already
-        import_path = os.path.dirname(inspect.getfile(os))
-        path = path.replace(os.path.join(import_path, 'site-packages'), '')
-        path = path.replace(import_path, '')
-
-        # Make relative
-        path = path.replace(os.sep, '', 1)
-        start_line = inspect.getsourcelines(obj)[1]
-
-        path = _update_friendly_package_name(path)
-
-        # Get folder name from conf.py
-        path = os.path.join(app.config.folder, path)
-
-        # append relative path defined in conf.py (in case of "binding python" project)
-        try:
-            source_prefix  # does source_prefix exist in the current namespace
-            path = source_prefix + path
-        except NameError:
-            pass
+        path = _get_source_path(app, full_path)
+        start_line = app.docfx_source_lines.start_line(obj)
 
     except (TypeError, OSError):
         print("Can't inspect type {}: {}".format(type(obj), name))
         path = None
         start_line = None
 
-    datam = {
-        'module': module,
-        'uid': name,
-        'type': _type,
-        'name': short_name,
-        'fullName': name,
-        'source': {
-            'remote': {
-                'path': path,
-                'branch': app.env.docfx_branch,
-                'repo': app.env.docfx_remote,
-            },
-            'id': short_name,
-            'path': path,
-            'startLine': start_line,
-        },
-        'langs': ['python'],
-    }
+    datam = Item(
+        module=module,
+        uid=name,
+        type=_type,
+        name=short_name,
+        full_name=name,
+        source=Source(
+            path=path,
+            branch=app.env.docfx_branch,
+            repo=app.env.docfx_remote,
+            id=short_name,
+            start_line=start_line,
+        ),
+    )
 
     # Only add summary to parts of the code that we don't get it from the monkeypatch
     if _type == MODULE:
         lines = _resolve_reference_in_module_summary(lines)
         summary = app.docfx_transform_string('\n'.join(_refact_example_in_module_summary(lines)))
         if summary:
-            datam['summary'] = summary.strip(" \n\r\r")
-
-    if args or sig:
-        datam['syntax'] = {}
-        if args:
-            datam['syntax']['parameters'] = args
-        if sig:
-            datam['syntax']['content'] = sig
+            datam.summary = summary.strip(" \n\r\r")
+
+    if args:
+        datam.syntax_parameters = args
+    if sig:
+        datam.syntax_content = sig
     if cls:
-        datam[CLASS] = cls
+        datam.cls = cls
     if _type in [CLASS, MODULE]:
-        datam['children'] = []
-        datam['references'] = []
+        datam.children = []
+        datam.references = ReferenceSet()
 
     if _type in [FUNCTION, METHOD]:
-        datam['name'] = app.env.docfx_signature_funcs_methods.get(name, datam['name'])
+        datam.name = signatures.get(name, datam.name)
 
     return datam
 
@@ -395,10 +381,24 @@ def process_docstring(app, _type, name, obj, options, lines):
         return None
 
     datam = _create_datam(app, cls, module, name, _type, obj, lines)
+    insert_inheritance(app, _type, obj, datam)
+
+    get_doc_data(app.env)['objects'].append((_type, datam))
+
+
+def insert_datam(app, _type, datam):
+    """
+    Index a datam read from a document into the YAML object stores.
+    """
+    name = datam['uid']
+    cls, module = _get_cls_module(_type, name)
 
     if _type == MODULE:
         if module not in app.env.docfx_yaml_modules:
             app.env.docfx_yaml_modules[module] = [datam]
+            app.env.docfx_module_datams[module] = datam
+            parent_module_name = module.rpartition('.')[0]
+            app.env.docfx_module_children.setdefault(parent_module_name, []).append(module)
         else:
             app.env.docfx_yaml_modules[module].append(datam)
 
@@ -420,7 +420,6 @@ def process_docstring(app, _type, name, obj, options, lines):
         else:
             app.env.docfx_yaml_functions[cls].append(datam)
 
-    insert_inheritance(app, _type, obj, datam)
     insert_children_on_module(app, _type, datam)
     insert_children_on_class(app, _type, datam)
     insert_children_on_function(app, _type, datam)
@@ -432,7 +431,70 @@ def process_signature(app, _type, name, obj, options, signature, return_annotati
     if signature:
         short_name = name.split('.')[-1]
         signature = short_name + signature
-        app.env.docfx_signature_funcs_methods[name] = signature
+        get_doc_data(app.env)['signatures'][name] = signature
+
+
+def get_outdated_docs(app, env, added, changed, removed):
+    """
+    Read again the documents read with other git metadata, as the sources of their objects use it.
+    """
+    metadata = GitMetadata(remote=env.docfx_remote, branch=env.docfx_branch, root=env.docfx_root)
+    if getattr(env, 'docfx_read_git_metadata', None) != metadata:
+        return list(env.docfx_doc_data)
+    return []
+
+
+def record_git_metadata(app, env, docnames):
+    """
+    Record the git metadata the documents about to be read use, see get_outdated_docs.
+    """
+    env.docfx_read_git_metadata = GitMetadata(
+        remote=env.docfx_remote, branch=env.docfx_branch, root=env.docfx_root)
+
+
+def purge_doc_data(app, env, docname):
+    """
+    Remove the data read from a document which is about to be re-read or is removed.
+    """
+    env.docfx_doc_data.pop(docname, None)
+
+
+def merge_doc_data(app, env, docnames, other):
+    """
+    Merge the data read by a parallel reading process into the main environment.
+    """
+    for docname in docnames:
+        if docname in other.docfx_doc_data:
+            env.docfx_doc_data[docname] = other.docfx_doc_data[docname]
+
+
+def build_yaml_stores(app, env, release=False):
+    """
+    Rebuild the YAML object stores from the data of every document.
+
+    Documents are processed in sorted order, the same order as a serial read,
+    so that serial, parallel and incremental builds give the same output.
+    The data is copied, with its records converted to dicts,
+    because the stores are modified while outputting.
+    If release is true, the data of each document is dropped once copied,
+    it is already in the pickled environment for the next build.
+    """
+    env.docfx_yaml_modules = {}
+    env.docfx_module_datams = {}
+    env.docfx_module_children = {}
+    env.docfx_yaml_classes = {}
+    env.docfx_yaml_functions = {}
+    env.docfx_info_field_data = {}
+    env.docfx_info_uid_types = {}
+
+    for docname in sorted(env.docfx_doc_data):
+        if release:
+            doc_data = to_data(env.docfx_doc_data.pop(docname))
+        else:
+            doc_data = to_data(env.docfx_doc_data[docname])
+        env.docfx_info_field_data.update(doc_data['info_field_data'])
+        for _type, datam in doc_data['objects']:
+            insert_datam(app, _type, datam)
 
 
 def insert_inheritance(app, _type, obj, datam):
@@ -446,12 +508,12 @@ def insert_inheritance(app, _type, obj, datam):
             to_add['inheritance'].append(new_add)
 
     if hasattr(obj, '__bases__'):
-        if 'inheritance' not in datam:
-            datam['inheritance'] = []
+        if not hasattr(datam, 'inheritance'):
+            datam.inheritance = []
         for base in obj.__bases__:
             to_add = {'type': _fullname(base)}
             collect_inheritance(base, to_add)
-            datam['inheritance'].append(to_add)
+            datam.inheritance.append(to_add)
 
 
 def insert_children_on_module(app, _type, datam):
@@ -463,54 +525,39 @@ def insert_children_on_module(app, _type, datam):
         return
     insert_module = app.env.docfx_yaml_modules[datam[MODULE]]
     # Find the module which the datam belongs to
-    for obj in insert_module:
-        # Add standardlone function to global class
-        if _type in [FUNCTION] and \
-                obj['type'] == MODULE and \
-                obj[MODULE] == datam[MODULE]:
-            obj['children'].append(datam['uid'])
+    obj = app.env.docfx_module_datams[datam[MODULE]]
+    # Add standardlone function to global class
+    if _type in [FUNCTION]:
+        obj['children'].append(datam['uid'])
 
-            # If it is a function, add this to its module. No need for class and module since this is
-            # done before calling this function.
-            insert_module.append(datam)
+        # If it is a function, add this to its module. No need for class and module since this is
+        # done before calling this function.
+        insert_module.append(datam)
 
-            obj['references'].append(_create_reference(datam, parent=obj['uid']))
-            break
-        # Add classes & exceptions to module
-        if _type in [CLASS, EXCEPTION] and \
-                obj['type'] == MODULE and \
-                obj[MODULE] == datam[MODULE]:
-            obj['children'].append(datam['uid'])
-            obj['references'].append(_create_reference(datam, parent=obj['uid']))
-            break
+        obj['references'].append(_create_reference(datam, parent=obj['uid']))
+    # Add classes & exceptions to module
+    if _type in [CLASS, EXCEPTION]:
+        obj['children'].append(datam['uid'])
+        obj['references'].append(_create_reference(datam, parent=obj['uid']))
 
     if _type in [MODULE]: # Make sure datam is a module.
         # Add this module(datam) to parent module node
         if datam[MODULE].count('.') >= 1:
             parent_module_name = '.'.join(datam[MODULE].split('.')[:-1])
 
-            if parent_module_name not in app.env.docfx_yaml_modules:
+            if parent_module_name not in app.env.docfx_module_datams:
                 return
 
-            insert_module = app.env.docfx_yaml_modules[parent_module_name]
-
-            for obj in insert_module:
-                if obj['type'] == MODULE and obj[MODULE] == parent_module_name:
-                    obj['children'].append(datam['uid'])
-                    obj['references'].append(_create_reference(datam, parent=obj['uid']))
-                    break
+            obj = app.env.docfx_module_datams[parent_module_name]
+            obj['children'].append(datam['uid'])
+            obj['references'].append(_create_reference(datam, parent=obj['uid']))
 
         # Add datam's children modules to it. Based on Python's passing by reference.
         # If passing by reference would be changed in python's future release.
-        # Time complex: O(N^2)
-        for module, module_contents in app.env.docfx_yaml_modules.items():
-            if module != datam['uid'] and \
-                    module[:module.rfind('.')] == datam['uid']: # Current module is submodule/subpackage of datam
-                for obj in module_contents: # Traverse module's contents to find the module itself.
-                    if obj['type'] == MODULE and obj['uid'] == module:
-                        datam['children'].append(module)
-                        datam['references'].append(_create_reference(obj, parent=module))
-                        break
+        for module in app.env.docfx_module_children.get(datam['uid'], []):
+            obj = app.env.docfx_module_datams[module]
+            datam['children'].append(module)
+            datam['references'].append(_create_reference(obj, parent=module))
 
 
 def insert_children_on_class(app, _type, datam):
@@ -544,23 +591,108 @@ def insert_children_on_function(app, _type, datam):
     insert_functions.append(datam)
 
 
-def build_finished(app, exception):
+def _load_manifest(manifest_file, outdir, serializer):
     """
-    Output YAML on the file system.
+    Load the file name -> FileHashes mapping of the YAML files written by the last build
     """
-    def find_node_in_toc_tree(toc_yaml, to_add_node):
-        for module in toc_yaml:
-            if module['name'] == to_add_node:
-                return module
+    try:
+        with open(manifest_file, 'r') as manifest_file_obj:
+            manifest = json.load(manifest_file_obj)
+    except (OSError, ValueError):
+        return {}
+
+    # The output files are somewhere else or formatted by another serializer,
+    # they all need to be written
+    if manifest.get('outdir') != outdir or manifest.get('serializer') != serializer:
+        return {}
+    try:
+        return {filename: FileHashes(*hashes)
+                for filename, hashes in manifest.get('files', {}).items()}
+    except TypeError:
+        # Written by a version only keeping the content hashes
+        return {}
 
-            if 'items' in module:
-                items = module['items']
-                found_module = find_node_in_toc_tree(items, to_add_node)
-                if found_module != None:
-                    return found_module
 
-        return None
+def _save_manifest(manifest_file, outdir, serializer, files):
+    ensuredir(os.path.dirname(manifest_file))
+    with open(manifest_file, 'w') as manifest_file_obj:
+        json.dump({'outdir': outdir, 'serializer': serializer, 'files': files},
+                  manifest_file_obj, sort_keys=True)
 
+
+def add_toc_node(toc_yaml, toc_nodes, uid):
+    """
+    Add a uid to the nested TOC, under the node of its parent level if there is one.
+
+    ``toc_nodes`` maps the uids already in the TOC to their node,
+    the first one added is kept as the same uid may be output more than once.
+    """
+    node = {'name': uid, 'uid': uid}
+
+    if uid.count('.') >= 1:
+        parent_level = '.'.join(uid.split('.')[:-1])
+        found_node = toc_nodes.get(parent_level)
+
+        if found_node:
+            found_node.pop('uid', 'No uid found')
+            found_node.setdefault('items', [{'name': 'Overview', 'uid': parent_level}]).append(node)
+        else:
+            toc_yaml.append(node)
+
+    else:
+        toc_yaml.append(node)
+
+    toc_nodes.setdefault(uid, node)
+
+
+def merge_added_attributes(obj, added_attribute, yaml_data, items_by_uid):
+    """
+    Merge the attributes found in the docstring of obj into the items of its file.
+
+    ``items_by_uid`` maps the uids of ``yaml_data`` to their first item,
+    attributes without an item are added to both.
+    """
+    for attrData in added_attribute:
+        existed_Data = items_by_uid.get(attrData['uid'])
+        if existed_Data:
+            # Update data for already existed one which has attribute comment in source file
+            existed_Data.update(attrData)
+        else:
+            obj.get('children', []).append(attrData['uid'])
+            yaml_data.append(attrData)
+            items_by_uid[attrData['uid']] = attrData
+            if 'class' in attrData:
+                # Get parent for attrData of Non enum class
+                parent = attrData['class']
+            else:
+                # Get parent for attrData of enum class
+                parent = attrData['parent']
+            obj['references'].append(_create_reference(attrData, parent))
+
+
+def release_yaml_data(app, data_set, uid, items, remaining_uids):
+    """
+    Free the data of the file of uid once it is written, for docfx_yaml_release_data.
+
+    The info field data of an item is freed with the last file containing its uid,
+    ``remaining_uids`` counts the items of each uid which are not output yet.
+    """
+    del data_set[uid]
+    for obj in items:
+        remaining_uids[obj['uid']] -= 1
+        if not remaining_uids[obj['uid']]:
+            del remaining_uids[obj['uid']]
+            app.env.docfx_info_field_data.pop(obj['uid'], None)
+
+
+def build_finished(app, exception):
+    """
+    Output YAML on the file system.
+
+    Files whose data is unchanged since the last build are not dumped again,
+    files whose content is unchanged are not written again,
+    and files of objects which don't exist anymore are removed.
+    """
     def convert_module_to_package_if_needed(obj):
         if 'source' in obj and 'path' in obj['source'] and obj['source']['path']:
             if obj['source']['path'].endswith(INITPY):
@@ -575,6 +707,15 @@ def build_finished(app, exception):
                     obj['type'] = 'package'
                     return
 
+    def write_yaml(filename, data, header=True):
+        """
+        Dump data into <filename>.yml, left untouched if it's the same as in the last build.
+        With several docfx_yaml_workers, it is written by a worker process.
+        """
+        out_file = os.path.join(normalized_outdir, '%s.yml' % filename)
+        out_files[filename] = out_file
+        writer.write(out_file, data, header, old_manifest.get(filename))
+
 
     normalized_outdir = os.path.normpath(os.path.join(
         app.builder.outdir,  # Output Directory for Builder
@@ -582,210 +723,201 @@ def build_finished(app, exception):
     ))
     ensuredir(normalized_outdir)
 
-    toc_yaml = []
-    # Used to record filenames dumped to avoid confliction
-    # caused by Windows case insensitive file system
-    file_name_set = set()
-
-    # Order matters here, we need modules before lower level classes,
-    # so that we can make sure to inject the TOC properly
-    for data_set in (app.env.docfx_yaml_modules,
-                     app.env.docfx_yaml_classes, 
-                     app.env.docfx_yaml_functions):  # noqa
-
-        for uid, yaml_data in iter(sorted(data_set.items())):
-            if not uid:
-                # Skip objects without a module
-                continue
-
-            references = []
-
-            # Merge module data with class data
-            for obj in yaml_data:
-                arg_params = obj.get('syntax', {}).get('parameters', [])
-                if(len(arg_params) > 0 and 'id' in arg_params[0] and arg_params[0]['id'] == 'self'):
-                    # Support having `self` as an arg param, but not documented
-                    arg_params = arg_params[1:]
-                    obj['syntax']['parameters'] = arg_params
-                if obj['uid'] in app.env.docfx_info_field_data and \
-                    obj['type'] == app.env.docfx_info_field_data[obj['uid']]['type']:
-                    # Avoid entities with same uid and diff type.
-                    del(app.env.docfx_info_field_data[obj['uid']]['type']) # Delete `type` temporarily
-                    if 'syntax' not in obj:
-                        obj['syntax'] = {}
-                    merged_params = []
-                    if 'parameters' in app.env.docfx_info_field_data[obj['uid']]:
-                        doc_params = app.env.docfx_info_field_data[obj['uid']].get('parameters', [])
-                        if arg_params and doc_params:
-                            if len(arg_params) - len(doc_params) > 0:
-                                app.warn(
-                                    "Documented params don't match size of params:"
-                                    " {}".format(obj['uid']))
-                            # Zip 2 param lists until the long one is exhausted
-                            for args, docs in zip_longest(arg_params, doc_params, fillvalue={}):
-                                if len(args) == 0:
-                                    merged_params.append(docs)
-                                else:
-                                    args.update(docs)
-                                    merged_params.append(args)
-                    obj['syntax'].update(app.env.docfx_info_field_data[obj['uid']])
-                    if merged_params:
-                        obj['syntax']['parameters'] = merged_params
-
-                    if 'parameters' in obj['syntax'] and obj['type'] == 'method':	
-                        for args in obj['syntax']['parameters']:
-                            if 'isRequired' not in args and 'defaultValue' not in args:
-                                args['isRequired'] = True
-
-                    # Raise up summary
-                    if 'summary' in obj['syntax'] and obj['syntax']['summary']:
-                        obj['summary'] = obj['syntax'].pop('summary').strip(" \n\r\r")
-
-                    # Raise up remarks
-                    if 'remarks' in obj['syntax'] and obj['syntax']['remarks']:
-                        obj['remarks'] = obj['syntax'].pop('remarks')
-
-                    # Raise up seealso
-                    if 'seealso' in obj['syntax'] and obj['syntax']['seealso']:
-                        obj['seealsoContent'] = obj['syntax'].pop('seealso')
-
-                    # Raise up example
-                    if 'example' in obj['syntax'] and obj['syntax']['example']:
-                        obj.setdefault('example', []).append(obj['syntax'].pop('example'))
-
-                    # Raise up exceptions
-                    if 'exceptions' in obj['syntax'] and obj['syntax']['exceptions']:
-                        obj['exceptions'] = obj['syntax'].pop('exceptions')
-
-                    # Raise up references
-                    if 'references' in obj['syntax'] and obj['syntax']['references']:
-                        obj.setdefault('references', []).extend(obj['syntax'].pop('references'))
-
-                    # add content of temp list 'added_attribute' to children and yaml_data
-                    if 'added_attribute' in obj['syntax'] and obj['syntax']['added_attribute']:
-                        added_attribute = obj['syntax'].pop('added_attribute')
-                        for attrData in added_attribute:
-                            existed_Data = next((n for n in yaml_data if n['uid'] == attrData['uid']), None)
-                            if existed_Data:
-                                # Update data for already existed one which has attribute comment in source file
-                                existed_Data.update(attrData)
-                            else:
-                                obj.get('children', []).append(attrData['uid'])
-                                yaml_data.append(attrData)
-                                if 'class' in attrData:
-                                    # Get parent for attrData of Non enum class
-                                    parent = attrData['class']
-                                else:
-                                    # Get parent for attrData of enum class
-                                    parent = attrData['parent']
-                                obj['references'].append(_create_reference(attrData, parent))
-                    app.env.docfx_info_field_data[obj['uid']]['type'] = obj['type'] # Revert `type` for other objects to use
-
-                if 'references' in obj:
-                    # Ensure that references have no duplicate ref
-                    ref_uids = [r['uid'] for r in references]
-                    for ref_obj in obj['references']:
-                        if ref_obj['uid'] not in ref_uids:
-                            references.append(ref_obj)
-                    obj.pop('references')
-
-                if obj['type'] == 'module':
-                    convert_module_to_package_if_needed(obj)
-
-                if obj['type'] == 'method':
-                    obj['namewithoutparameters'] = obj['source']['id']
-
-                # To distinguish distribution package and import package
-                if obj.get('type', '') == 'package' and obj.get('kind', '') != 'distribution':
-                    obj['kind'] = 'import'
-
-                try:
-                    if remove_inheritance_for_notfound_class:
+    manifest_file = os.path.join(app.doctreedir, MANIFEST_FILENAME)
+    old_manifest = _load_manifest(manifest_file, normalized_outdir, app.docfx_yaml_serializer)
+    # File name -> path of the YAML files of this build
+    out_files = {}
+    writer = YamlFileWriter(app.docfx_yaml_serializer, app.docfx_settings.workers)
+    try:
+        toc_yaml = []
+        # Used to find the TOC node of a uid
+        toc_nodes = {}
+        # Used to record filenames dumped to avoid confliction
+        # caused by Windows case insensitive file system
+        file_name_set = set()
+
+        release_data = app.config.docfx_yaml_release_data
+        # The stores are built here rather than when reading is done,
+        # so that they are not pickled with the environment
+        build_yaml_stores(app, app.env, release_data)
+
+        # Order matters here, we need modules before lower level classes,
+        # so that we can make sure to inject the TOC properly
+        data_sets = (app.env.docfx_yaml_modules,
+                     app.env.docfx_yaml_classes,
+                     app.env.docfx_yaml_functions)
+
+        if release_data:
+            # Number of items left to output for each uid
+            remaining_uids = Counter(obj['uid'] for data_set in data_sets
+                                     for yaml_data in data_set.values() for obj in yaml_data)
+            # Only used to build the stores
+            app.env.docfx_module_datams = {}
+            app.env.docfx_module_children = {}
+
+        for data_set in data_sets:
+
+            for uid in sorted(data_set):
+                if not uid:
+                    # Skip objects without a module
+                    continue
+
+                yaml_data = data_set[uid]
+                original_count = len(yaml_data)
+                references = ReferenceSet()
+                # Used to find the first item of a uid, kept up to date as attributes are added
+                items_by_uid = {}
+                for obj in yaml_data:
+                    items_by_uid.setdefault(obj['uid'], obj)
+
+                # Merge module data with class data
+                for obj in yaml_data:
+                    arg_params = obj.get('syntax', {}).get('parameters', [])
+                    if(len(arg_params) > 0 and 'id' in arg_params[0] and arg_params[0]['id'] == 'self'):
+                        # Support having `self` as an arg param, but not documented
+                        arg_params = arg_params[1:]
+                        obj['syntax']['parameters'] = arg_params
+                    if obj['uid'] in app.env.docfx_info_field_data and \
+                        obj['type'] == app.env.docfx_info_field_data[obj['uid']]['type']:
+                        # Avoid entities with same uid and diff type.
+                        del(app.env.docfx_info_field_data[obj['uid']]['type']) # Delete `type` temporarily
+                        if 'syntax' not in obj:
+                            obj['syntax'] = {}
+                        merged_params = []
+                        if 'parameters' in app.env.docfx_info_field_data[obj['uid']]:
+                            doc_params = app.env.docfx_info_field_data[obj['uid']].get('parameters', [])
+                            if arg_params and doc_params:
+                                if len(arg_params) - len(doc_params) > 0:
+                                    app.warn(
+                                        "Documented params don't match size of params:"
+                                        " {}".format(obj['uid']))
+                                # Zip 2 param lists until the long one is exhausted
+                                for args, docs in zip_longest(arg_params, doc_params, fillvalue={}):
+                                    if len(args) == 0:
+                                        merged_params.append(docs)
+                                    else:
+                                        args.update(docs)
+                                        merged_params.append(args)
+                        obj['syntax'].update(app.env.docfx_info_field_data[obj['uid']])
+                        if merged_params:
+                            obj['syntax']['parameters'] = merged_params
+
+                        if 'parameters' in obj['syntax'] and obj['type'] == 'method':	
+                            for args in obj['syntax']['parameters']:
+                                if 'isRequired' not in args and 'defaultValue' not in args:
+                                    args['isRequired'] = True
+
+                        # Raise up summary
+                        if 'summary' in obj['syntax'] and obj['syntax']['summary']:
+                            obj['summary'] = obj['syntax'].pop('summary').strip(" \n\r\r")
+
+                        # Raise up remarks
+                        if 'remarks' in obj['syntax'] and obj['syntax']['remarks']:
+                            obj['remarks'] = obj['syntax'].pop('remarks')
+
+                        # Raise up seealso
+                        if 'seealso' in obj['syntax'] and obj['syntax']['seealso']:
+                            obj['seealsoContent'] = obj['syntax'].pop('seealso')
+
+                        # Raise up example
+                        if 'example' in obj['syntax'] and obj['syntax']['example']:
+                            obj.setdefault('example', []).append(obj['syntax'].pop('example'))
+
+                        # Raise up exceptions
+                        if 'exceptions' in obj['syntax'] and obj['syntax']['exceptions']:
+                            obj['exceptions'] = obj['syntax'].pop('exceptions')
+
+                        # Raise up references
+                        if 'references' in obj['syntax'] and obj['syntax']['references']:
+                            obj.setdefault('references', ReferenceSet()).extend(
+                                obj['syntax'].pop('references'))
+
+                        # add content of temp list 'added_attribute' to children and yaml_data
+                        if 'added_attribute' in obj['syntax'] and obj['syntax']['added_attribute']:
+                            merge_added_attributes(
+                                obj, obj['syntax'].pop('added_attribute'), yaml_data, items_by_uid)
+                        app.env.docfx_info_field_data[obj['uid']]['type'] = obj['type'] # Revert `type` for other objects to use
+
+                    if 'references' in obj:
+                        # Ensure that references have no duplicate ref
+                        references.extend(obj.pop('references'))
+
+                    if obj['type'] == 'module':
+                        convert_module_to_package_if_needed(obj)
+
+                    if obj['type'] == 'method':
+                        obj['namewithoutparameters'] = obj['source']['id']
+
+                    # To distinguish distribution package and import package
+                    if obj.get('type', '') == 'package' and obj.get('kind', '') != 'distribution':
+                        obj['kind'] = 'import'
+
+                    if app.docfx_settings.remove_inheritance_for_notfound_class:
                         if 'inheritance' in obj:
                             python_sdk_name = obj['uid'].split('.')[0]
-                            obj['inheritance'] = [n for n in obj['inheritance'] if not n['type'].startswith(python_sdk_name) or
-                                                  n['type'] in app.env.docfx_info_uid_types]
+                            obj['inheritance'] = [
+                                n for n in obj['inheritance']
+                                if not n['type'].startswith(python_sdk_name) or
+                                n['type'] in app.env.docfx_info_uid_types]
                             if not obj['inheritance']:
                                 obj.pop('inheritance')
 
-                except NameError:
-                    pass
-
-                if 'source' in obj and (not obj['source']['remote']['repo'] or \
-                    obj['source']['remote']['repo'] == 'https://apidrop.visualstudio.com/Content%20CI/_git/ReferenceAutomation'):
-                        del(obj['source'])
+                    if 'source' in obj and (not obj['source']['remote']['repo'] or \
+                        obj['source']['remote']['repo'] == 'https://apidrop.visualstudio.com/Content%20CI/_git/ReferenceAutomation'):
+                            del(obj['source'])
 
-            # Output file
-            if uid.lower() in file_name_set:
-                filename = uid + "(%s)" % app.env.docfx_info_uid_types[uid]
-            else:
-                filename = uid
-
-            out_file = os.path.join(normalized_outdir, '%s.yml' % filename)
-            ensuredir(os.path.dirname(out_file))
-            if app.verbosity >= 1:
-                app.info(bold('[docfx_yaml] ') + darkgreen('Outputting %s' % filename))
-
-            with open(out_file, 'w') as out_file_obj:
-                out_file_obj.write('### YamlMime:UniversalReference\n')
-                try:
-                    dump(
-                        {
-                            'items': yaml_data,
-                            'references': references,
-                            'api_name': [],  # Hack around docfx YAML
-                        },
-                        out_file_obj,
-                        default_flow_style=False
-                    )
-                except Exception as e:
-                    raise ValueError("Unable to dump object\n{0}".format(yaml_data)) from e
-
-            file_name_set.add(filename)
-
-            # Build nested TOC
-            if uid.count('.') >= 1:
-                parent_level = '.'.join(uid.split('.')[:-1])
-                found_node = find_node_in_toc_tree(toc_yaml, parent_level)
-
-                if found_node:
-                    found_node.pop('uid', 'No uid found')
-                    found_node.setdefault('items', [{'name': 'Overview', 'uid': parent_level}]).append({'name': uid, 'uid': uid})
+                # Output file
+                if uid.lower() in file_name_set:
+                    filename = uid + "(%s)" % app.env.docfx_info_uid_types[uid]
                 else:
-                    toc_yaml.append({'name': uid, 'uid': uid})
-
-            else:
-                toc_yaml.append({'name': uid, 'uid': uid})
-
-    if len(toc_yaml) == 0:
-        raise RuntimeError("No documentation for this module.")
-
-    toc_file = os.path.join(normalized_outdir, 'toc.yml')
-    with open(toc_file, 'w') as writable:
-        writable.write(
-            dump(
-                [{
-                    'name': app.config.project,
-                    'items': [{'name': 'Overview', 'uid': 'project-' + app.config.project}] + toc_yaml
-                }],
-                default_flow_style=False,
-            )
+                    filename = uid
+
+                write_yaml(
+                    filename,
+                    {
+                        'items': yaml_data,
+                        'references': list(references),
+                        'api_name': [],  # Hack around docfx YAML
+                    }
+                )
+
+                file_name_set.add(filename)
+
+                # Build nested TOC
+                add_toc_node(toc_yaml, toc_nodes, uid)
+
+                if release_data:
+                    release_yaml_data(
+                        app, data_set, uid, yaml_data[:original_count], remaining_uids)
+
+        if release_data:
+            # What is left belongs to objects without a file of their own
+            app.env.docfx_info_field_data = {}
+
+        if len(toc_yaml) == 0:
+            raise RuntimeError("No documentation for this module.")
+
+        write_yaml(
+            'toc',
+            [{
+                'name': app.config.project,
+                'items': [{'name': 'Overview', 'uid': 'project-' + app.config.project}] + toc_yaml
+            }],
+            header=False
         )
 
-    index_file = os.path.join(normalized_outdir, 'index.yml')
-    index_children = []
-    index_references = []
-    for item in toc_yaml:
-        index_children.append(item.get('name', ''))
-        index_references.append({
-            'uid': item.get('name', ''),
-            'name': item.get('name', ''),
-            'fullname': item.get('name', ''),
-            'isExternal': False
-        })
-    with open(index_file, 'w') as index_file_obj:
-        index_file_obj.write('### YamlMime:UniversalReference\n')
-        dump(
+        index_children = []
+        index_references = []
+        for item in toc_yaml:
+            index_children.append(item.get('name', ''))
+            index_references.append({
+                'uid': item.get('name', ''),
+                'name': item.get('name', ''),
+                'fullname': item.get('name', ''),
+                'isExternal': False
+            })
+        write_yaml(
+            'index',
             {
                 'items': [{
                     'uid': 'project-' + app.config.project,
@@ -798,11 +930,33 @@ def build_finished(app, exception):
                     'children': index_children
                 }],
                 'references': index_references
-            },
-            index_file_obj,
-            default_flow_style=False
+            }
         )
 
+        writer.close()
+    finally:
+        # Stops the worker processes if writing failed, close already stopped them otherwise
+        writer.terminate()
+
+    manifest = {}
+    for filename, out_file in out_files.items():
+        manifest[filename] = writer.hashes[out_file]
+        old_hashes = old_manifest.get(filename)
+        if app.verbosity >= 1 and (
+                old_hashes is None or manifest[filename].content != old_hashes.content):
+            app.info(bold('[docfx_yaml] ') + darkgreen('Outputting %s' % filename))
+
+    # Remove files of objects which don't exist anymore
+    for filename in old_manifest:
+        if filename not in manifest:
+            out_file = os.path.join(normalized_outdir, '%s.yml' % filename)
+            if os.path.exists(out_file):
+                if app.verbosity >= 1:
+                    app.info(bold('[docfx_yaml] ') + darkgreen('Removing %s' % filename))
+                os.remove(out_file)
+
+    _save_manifest(manifest_file, normalized_outdir, app.docfx_yaml_serializer, manifest)
+
 
 def missing_reference(app, env, node, contnode):
     reftarget = ''
@@ -844,8 +998,26 @@ def setup(app):
     app.connect('builder-inited', build_init)
     app.connect('autodoc-process-docstring', process_docstring)
     app.connect('autodoc-process-signature', process_signature)
+    app.connect('env-get-outdated', get_outdated_docs)
+    app.connect('env-before-read-docs', record_git_metadata)
+    app.connect('env-purge-doc', purge_doc_data)
+    app.connect('env-merge-info', merge_doc_data)
     app.connect('build-finished', build_finished)
     app.connect('missing-reference', missing_reference)
     app.add_config_value('docfx_yaml_output', API_ROOT, 'html')
     app.add_config_value('folder', '', 'html')
     app.add_config_value('autodoc_functions', False, 'env')
+    app.add_config_value('docfx_yaml_serializer', PYTHON, 'html')
+    app.add_config_value('docfx_yaml_workers', 1, 'html')
+    app.add_config_value('docfx_yaml_release_data', False, 'html')
+    app.add_config_value('docfx_yaml_git_remote', None, 'env')
+    app.add_config_value('docfx_yaml_git_branch', None, 'env')
+    app.add_config_value('docfx_yaml_git_root', None, 'env')
+    app.add_config_value('namespace_package_dict', {}, 'env')
+    app.add_config_value('source_prefix', '', 'env')
+    app.add_config_value('remove_inheritance_for_notfound_class', False, 'html')
+
+    return {
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
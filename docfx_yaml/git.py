@@ -0,0 +1,160 @@
+# coding: utf-8
+
+"""
+This module is used to read the git metadata of the documented sources
+straight from the ``.git`` directory, without running git.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+# remote: URL of the first remote by name, as listed by ``git remote -v``
+# branch: current branch, ``HEAD`` when it's detached, as ``git rev-parse --abbrev-ref HEAD``
+# root: top level directory of the working tree, as ``git rev-parse --show-toplevel``
+GitMetadata = namedtuple('GitMetadata', ['remote', 'branch', 'root'])
+
+NO_GIT_METADATA = GitMetadata(None, None, None)
+
+SECTION_PATTERN = re.compile(r'\s*\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+VARIABLE_PATTERN = re.compile(r'\s*([a-zA-Z][-a-zA-Z0-9]*)\s*(?:=\s*(.*))?$')
+
+
+def find_git_dir(path):
+    """
+    Find the git directory of the working tree containing path.
+
+    Returns:
+        tuple: The git directory and the top level directory of the working tree,
+        or None if path isn't in a working tree.
+    """
+    path = os.path.realpath(path)
+    while True:
+        dot_git = os.path.join(path, '.git')
+        if os.path.isdir(dot_git):
+            return dot_git, path
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules point to their git directory
+            with open(dot_git) as dot_git_file:
+                content = dot_git_file.read().strip()
+            if content.startswith('gitdir:'):
+                git_dir = os.path.join(path, content[len('gitdir:'):].strip())
+                return os.path.normpath(git_dir), path
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def get_common_dir(git_dir):
+    """
+    Get the directory holding the config and refs shared by the worktrees of a repository.
+    """
+    common_dir_file = os.path.join(git_dir, 'commondir')
+    if os.path.isfile(common_dir_file):
+        with open(common_dir_file) as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    return git_dir
+
+
+def read_branch(git_dir):
+    """
+    Read the branch checked out in git_dir from its HEAD file.
+    """
+    with open(os.path.join(git_dir, 'HEAD')) as head_file:
+        head = head_file.read().strip()
+    if head.startswith('ref:'):
+        ref = head[len('ref:'):].strip()
+        if ref.startswith('refs/heads/'):
+            return ref[len('refs/heads/'):]
+        return ref
+    return 'HEAD'
+
+
+def _unquote(value):
+    """
+    Remove the comments, quotes and escapes of a git config value.
+    """
+    result = []
+    quoted = False
+    escaped = False
+    for char in value:
+        if escaped:
+            result.append({'n': '\n', 't': '\t', 'b': '\b'}.get(char, char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char in '#;' and not quoted:
+            break
+        else:
+            result.append(char)
+    return ''.join(result).strip()
+
+
+def read_remote(config_path):
+    """
+    Read the URL of the first remote by name from a git config file.
+    """
+    urls = {}
+    section = subsection = None
+    with open(config_path) as config_file:
+        for line in config_file:
+            match = SECTION_PATTERN.match(line)
+            if match:
+                section, subsection = match.group(1).lower(), match.group(2)
+                line = line[match.end():]
+                if not line.strip():
+                    continue
+
+            match = VARIABLE_PATTERN.match(line)
+            if (match and section == 'remote' and subsection is not None
+                    and match.group(1).lower() == 'url'):
+                urls.setdefault(subsection, _unquote(match.group(2) or ''))
+
+    if not urls:
+        return None
+    return urls[min(urls)]
+
+
+def _cache_key(git_dir, common_dir):
+    return (
+        git_dir,
+        os.path.getmtime(os.path.join(git_dir, 'HEAD')),
+        os.path.getmtime(os.path.join(common_dir, 'config')),
+    )
+
+
+def get_git_metadata(path, cache=None):
+    """
+    Get the git metadata of the working tree containing path.
+
+    Args:
+        path: Path in the working tree.
+        cache: Tuple of the cache key and metadata returned by an earlier call, if any.
+
+    Returns:
+        tuple: The cache key and the :class:`GitMetadata`, which is reused from cache
+        while HEAD and the config of the repository are unchanged.
+    """
+    found = find_git_dir(path)
+    if found is None:
+        return None, NO_GIT_METADATA
+    git_dir, root = found
+    common_dir = get_common_dir(git_dir)
+
+    try:
+        key = _cache_key(git_dir, common_dir)
+    except OSError:
+        return None, NO_GIT_METADATA
+    if cache is not None and cache[0] == key:
+        return cache
+
+    metadata = GitMetadata(
+        remote=read_remote(os.path.join(common_dir, 'config')),
+        branch=read_branch(git_dir),
+        root=root,
+    )
+    return key, metadata
@@ -0,0 +1,177 @@
+# coding: utf-8
+
+"""
+This module holds the records of the data read from the documents.
+
+Objects read by autodoc and the info field data are kept as records
+with ``__slots__`` rather than nested dicts, until the YAML stores are
+built from them. Fields a record doesn't have are left unset, and
+nested YAML keys such as ``source.remote`` are only made by
+:func:`to_data`, so a record takes a fraction of the memory of the dicts.
+
+Names, types and source strings repeat across many records. They are interned
+whenever a record field is set, unpickling included, so that data loaded from
+the environment or from parallel reading processes shares them too.
+"""
+
+import sys
+
+from .utils import ReferenceSet
+
+# Shared by the items, as all of them are python
+LANGS = ('python',)
+
+
+class Record(object):
+    """
+    Base class of the records, converted to dicts by :func:`to_data`.
+    """
+    __slots__ = ()
+
+    #: (attribute, path of keys in the dict) of each field, in the order of the dict
+    fields = ()
+    #: (path of keys in the dict, value) of the fields every record of the class has
+    constants = ()
+    #: Attributes whose strings, or lists of strings, are interned
+    interned = frozenset()
+
+    def __init__(self, **kwargs):
+        for attribute, value in kwargs.items():
+            setattr(self, attribute, value)
+
+    def __setattr__(self, attribute, value):
+        if attribute in self.interned:
+            value = intern_value(value)
+        object.__setattr__(self, attribute, value)
+
+    def __getitem__(self, key):
+        for attribute, path in self.fields:
+            if path == (key,) and hasattr(self, attribute):
+                return getattr(self, attribute)
+        raise KeyError(key)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.to_dict())
+
+    def to_dict(self):
+        data = {}
+        for path, value in self.constants:
+            _set_path(data, path, list(value))
+        for attribute, path in self.fields:
+            if hasattr(self, attribute):
+                _set_path(data, path, to_data(getattr(self, attribute)))
+        return data
+
+
+def _set_path(data, path, value):
+    for key in path[:-1]:
+        data = data.setdefault(key, {})
+    data[path[-1]] = value
+
+
+class Item(Record):
+    """
+    An object of the API: module, class, function, method or attribute.
+    """
+    __slots__ = (
+        'uid', 'module', 'type', 'name', 'full_name', 'id', 'parent', 'cls', 'source', 'summary',
+        'syntax_content', 'syntax_parameters', 'syntax_return_type', 'children', 'references',
+        'inheritance',
+    )
+    fields = (
+        ('module', ('module',)),
+        ('uid', ('uid',)),
+        ('id', ('id',)),
+        ('parent', ('parent',)),
+        ('cls', ('class',)),
+        ('type', ('type',)),
+        ('name', ('name',)),
+        ('full_name', ('fullName',)),
+        ('source', ('source',)),
+        ('summary', ('summary',)),
+        ('syntax_parameters', ('syntax', 'parameters')),
+        ('syntax_content', ('syntax', 'content')),
+        ('syntax_return_type', ('syntax', 'return', 'type')),
+        ('children', ('children',)),
+        ('references', ('references',)),
+        ('inheritance', ('inheritance',)),
+    )
+    constants = (
+        (('langs',), LANGS),
+    )
+    interned = frozenset([
+        'uid', 'module', 'type', 'name', 'full_name', 'id', 'parent', 'cls', 'syntax_return_type',
+    ])
+
+
+class Parameter(Record):
+    """
+    A parameter or variable of an item.
+    """
+    __slots__ = ('id', 'default_value', 'description', 'type', 'is_required')
+    fields = (
+        ('id', ('id',)),
+        ('default_value', ('defaultValue',)),
+        ('description', ('description',)),
+        ('type', ('type',)),
+        ('is_required', ('isRequired',)),
+    )
+    interned = frozenset(['id', 'default_value', 'type'])
+
+
+class Reference(Record):
+    """
+    A reference to a type, with the spec of its parts for generic types.
+    """
+    __slots__ = ('uid', 'name', 'full_name', 'spec')
+    fields = (
+        ('uid', ('uid',)),
+        ('name', ('name',)),
+        ('full_name', ('fullName',)),
+        ('spec', ('spec.python',)),
+    )
+    interned = frozenset(['uid', 'name', 'full_name'])
+
+
+class Source(Record):
+    """
+    Where the source of an item is, and the repository it is in.
+    """
+    __slots__ = ('path', 'branch', 'repo', 'id', 'start_line')
+    fields = (
+        ('path', ('remote', 'path')),
+        ('branch', ('remote', 'branch')),
+        ('repo', ('remote', 'repo')),
+        ('id', ('id',)),
+        ('path', ('path',)),
+        ('start_line', ('startLine',)),
+    )
+    interned = frozenset(['path', 'branch', 'repo', 'id'])
+
+
+def intern_value(value):
+    """
+    Intern a string, or the strings of a list.
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is list:
+        return [intern_value(item) for item in value]
+    return value
+
+
+def to_data(value):
+    """
+    Copy value, converting the records it holds to dicts.
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_data(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_data(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(to_data(item) for item in value)
+    if isinstance(value, ReferenceSet):
+        return ReferenceSet(to_data(reference) for reference in value)
+    return value
@@ -8,7 +8,8 @@ from sphinx import directives, addnodes
 from sphinx import addnodes
 
 from sphinx.addnodes import desc, desc_signature
-from .utils import transform_node as _transform_node
+from .utils import transform_node as _transform_node, get_doc_data, ReferenceSet
+from .model import Item, Parameter, Reference, intern_value
 from .nodes import remarks
 
 TYPE_SEP_PATTERN = '(\[|\]|, |\(|\))'
@@ -157,19 +158,19 @@ def patch_docfields(app):
             'variables': [],
             'exceptions': [],
             'return': {},
-            'references': [],
+            'references': ReferenceSet(),
         }
 
         def make_param(_id, _description, _type=None, _required=None):
-            ret = {
-                'id': _id,
-                'description': _description.strip(" \n\r\t")
-            }
+            ret = Parameter(
+                id=_id,
+                description=_description.strip(" \n\r\t")
+            )
             if _type:
-                ret['type'] = _type
+                ret.type = _type
 
             if _required is not None:
-                ret['isRequired'] = _required
+                ret.is_required = _required
 
             return ret
 
@@ -187,25 +188,25 @@ def patch_docfields(app):
             _spec_list = []
             _spec_fullnames = re.split(TYPE_SEP_PATTERN, data_type)
 
-            _added_reference = {}
+            _added_reference = None
             if len(_spec_fullnames) > 1:
                 _added_reference_name = ''
                 for _spec_fullname in _spec_fullnames:
                     if _spec_fullname != '':
-                        _spec = {}
-                        _spec['name'] = _spec_fullname.split('.')[-1]
-                        _spec['fullName'] = _spec_fullname
+                        _spec = Reference()
+                        _spec.name = _spec_fullname.split('.')[-1]
+                        _spec.full_name = _spec_fullname
                         if re.match(TYPE_SEP_PATTERN, _spec_fullname) is None:
-                            _spec['uid'] = _spec_fullname
+                            _spec.uid = _spec_fullname
                         _spec_list.append(_spec)
-                        _added_reference_name += _spec['name']
+                        _added_reference_name += _spec.name
 
-                _added_reference = {
-                    'uid': data_type,
-                    'name': _added_reference_name,
-                    'fullName': data_type,
-                    'spec.python': _spec_list
-                }
+                _added_reference = Reference(
+                    uid=data_type,
+                    name=_added_reference_name,
+                    full_name=data_type,
+                    spec=_spec_list
+                )
 
             return data_type, _added_reference
 
@@ -242,7 +243,7 @@ def patch_docfields(app):
                 if fieldtype.name == 'exceptions':
                     for _type, _description in content:
                         data['exceptions'].append({
-                            'type': _type,
+                            'type': intern_value(_type),
                             'description': transform_node(_description[0]).strip(" \n\r\t")
                         })
                 if fieldtype.name == 'returntype':
@@ -253,12 +254,10 @@ def patch_docfields(app):
                             for returntype in re.split('[ \n]or[ \n]', returntype_ret):
                                 returntype, _added_reference = resolve_type(returntype)
                                 if _added_reference:
-                                    if len(data['references']) == 0:
-                                        data['references'].append(_added_reference)
-                                    elif any(r['uid'] != _added_reference['uid'] for r in data['references']):
-                                        data['references'].append(_added_reference)
+                                    data['references'].append(_added_reference)
 
-                                data['return'].setdefault('type', []).append(returntype)
+                                data['return'].setdefault('type', []).append(
+                                    intern_value(returntype))
                 if fieldtype.name == 'returnvalue':
                     returnvalue_ret = transform_node(content[1][0])
                     if returnvalue_ret:
@@ -279,10 +278,7 @@ def patch_docfields(app):
                                 for _s_type in re.split('[ \n]or[ \n]', _type):
                                     _s_type, _added_reference = resolve_type(_s_type)
                                     if _added_reference:
-                                        if len(data['references']) == 0:
-                                            data['references'].append(_added_reference)
-                                        elif any(r['uid'] != _added_reference['uid'] for r in data['references']):
-                                            data['references'].append(_added_reference)
+                                        data['references'].append(_added_reference)
 
                                     _para_types.append(_s_type)
 
@@ -297,10 +293,7 @@ def patch_docfields(app):
                                 for _s_type in re.split('[ \n]or[ \n]', _type):
                                     _s_type, _added_reference = resolve_type(_s_type)
                                     if _added_reference:
-                                        if len(data['references']) == 0:
-                                            data['references'].append(_added_reference)
-                                        elif any(r['uid'] != _added_reference['uid'] for r in data['references']):
-                                            data['references'].append(_added_reference)
+                                        data['references'].append(_added_reference)
 
                                     _para_types.append(_s_type)
 
@@ -311,7 +304,7 @@ def patch_docfields(app):
                     for ret in ret_list:
                         # only use type in exceptions
                         data.setdefault('exceptions', []).append({
-                            'type': ret['type']
+                            'type': intern_value(ret['type'])
                         })
 
         return data
@@ -366,41 +359,36 @@ def patch_docfields(app):
 
                                     if curuid in attribute_map:
                                         if len(item_ids) == 0: # ensure the order of docstring attributes and real attributes is fixed
-                                            attribute_map[curuid]['syntax']['content'] += (' ' + item.astext())
+                                            attribute = attribute_map[curuid]
+                                            attribute.syntax_content += (' ' + item.astext())
                                             # concat the description of duplicated nodes
                                         else:
-                                            attribute_map[curuid]['syntax']['content'] = item.astext() + ' ' + attribute_map[curuid]['syntax']['content']
+                                            attribute = attribute_map[curuid]
+                                            attribute.syntax_content = (
+                                                item.astext() + ' ' + attribute.syntax_content)
                                     else:
                                         if _is_desc_of_enum_class(node):
-                                            addedData = {
-                                                'uid': curuid,
-                                                'id': name,
-                                                'parent': parent,
-                                                'langs': ['python'],
-                                                'name': name,
-                                                'fullName': curuid,
-                                                'type': item.parent.get('desctype'),
-                                                'module': item.get('module'),
-                                                'syntax': {
-                                                    'content': item.astext(),
-                                                    'return': {
-                                                        'type': [parent]
-                                                    }
-                                                }
-                                            }
+                                            addedData = Item(
+                                                uid=curuid,
+                                                id=name,
+                                                parent=parent,
+                                                name=name,
+                                                full_name=curuid,
+                                                type=item.parent.get('desctype'),
+                                                module=item.get('module'),
+                                                syntax_content=item.astext(),
+                                                syntax_return_type=[parent]
+                                            )
                                         else:
-                                            addedData = {
-                                                'uid': curuid,
-                                                'class': parent,
-                                                'langs': ['python'],
-                                                'name': name,
-                                                'fullName': curuid,
-                                                'type': 'attribute',
-                                                'module': item.get('module'),
-                                                'syntax': {
-                                                    'content': item.astext()
-                                                }
-                                            }
+                                            addedData = Item(
+                                                uid=curuid,
+                                                cls=parent,
+                                                name=name,
+                                                full_name=curuid,
+                                                type='attribute',
+                                                module=item.get('module'),
+                                                syntax_content=item.astext()
+                                            )
 
                                         attribute_map[curuid] = addedData
                                 else:
@@ -439,7 +427,7 @@ def patch_docfields(app):
                 if not val:
                     del data[key]
             data['type'] = PatchedDocFieldTransformer.type_mapping(node.parent["desctype"]) if "desctype" in node.parent else 'unknown'
-            self.directive.env.docfx_info_field_data[uid] = data
+            get_doc_data(self.directive.env)['info_field_data'][intern_value(uid)] = data
             super(PatchedDocFieldTransformer, self).transform_all(node)
 
     directives.DocFieldTransformer = PatchedDocFieldTransformer
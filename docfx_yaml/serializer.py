@@ -0,0 +1,419 @@
+# coding: utf-8
+
+"""
+This module is used to dump the YAML files with the serializer backend
+chosen by the ``docfx_yaml_serializer`` config value.
+"""
+
+import os
+import copy
+import pickle
+import hashlib
+import multiprocessing
+from collections import namedtuple, deque
+
+import yaml
+from yaml import events
+
+from sphinx.errors import ExtensionError
+from sphinx.util import ensuredir
+
+try:
+    from yaml import CSafeDumper
+except ImportError:
+    # PyYAML is installed without libyaml bindings
+    CSafeDumper = None
+
+YAML_MIME = '### YamlMime:UniversalReference\n'
+
+AUTO = 'auto'
+LIBYAML = 'libyaml'
+PYTHON = 'python'
+
+# Serializer backend name -> PyYAML dumper class
+DUMPERS = {
+    LIBYAML: CSafeDumper,
+    PYTHON: yaml.SafeDumper,
+}
+
+
+def resolve_serializer(name):
+    """
+    Get the name of the serializer backend to use for a ``docfx_yaml_serializer`` value.
+
+    ``auto`` uses libyaml when PyYAML is built with it, and the pure-Python emitter otherwise.
+    """
+    if name == AUTO:
+        return LIBYAML if DUMPERS[LIBYAML] is not None else PYTHON
+
+    if name not in DUMPERS:
+        raise ExtensionError('Unknown docfx_yaml_serializer {!r}, it should be one of: {}'.format(
+            name, ', '.join(sorted([AUTO] + list(DUMPERS)))))
+    if DUMPERS[name] is None:
+        raise ExtensionError('docfx_yaml_serializer is {!r} but PyYAML is installed '
+                             'without libyaml bindings'.format(name))
+    return name
+
+
+def dump(data, stream=None, serializer=PYTHON):
+    """
+    Dump data as block style YAML, into stream if it's given or as a returned string.
+    """
+    return yaml.dump(data, stream, Dumper=DUMPERS[serializer], default_flow_style=False)
+
+
+# Bounds of the values kept by _DocumentEmitter.scalar_implicit
+IMPLICIT_CACHE_VALUE_LENGTH = 64
+IMPLICIT_CACHE_SIZE = 4096
+
+
+def _find_anchors(node, anchors, seen):
+    """
+    Give an anchor to the nodes found more than once under node, as yaml.serializer.Serializer does.
+    """
+    if node in seen:
+        if node not in anchors:
+            anchors[node] = 'id%03d' % (len(anchors) + 1)
+        return
+    seen.add(node)
+    if node.id == 'sequence':
+        for item in node.value:
+            _find_anchors(item, anchors, seen)
+    elif node.id == 'mapping':
+        for key, value in node.value:
+            _find_anchors(key, anchors, seen)
+            _find_anchors(value, anchors, seen)
+
+
+class _DocumentEmitter(object):
+    """
+    Emit a YAML document with a dumper, representing its parts one at a time.
+
+    Nodes are emitted as yaml.serializer.Serializer does. The dumpers of DUMPERS
+    have no path resolvers, so the tags resolved without implicit resolvers
+    are always the default ones. Short scalars, such as mapping keys, repeat a lot:
+    whether their tag is implicit is kept, for a bounded number of them.
+    """
+
+    def __init__(self, dumper):
+        self.dumper = dumper
+        self.emit = dumper.emit
+        # (tag, value) -> implicit of the short scalars
+        self.implicit = {}
+
+    def start(self):
+        self.emit(events.StreamStartEvent())
+        self.emit(events.DocumentStartEvent(explicit=False))
+
+    def end(self):
+        self.emit(events.DocumentEndEvent(explicit=False))
+        self.emit(events.StreamEndEvent())
+
+    def start_mapping(self):
+        self.emit(events.MappingStartEvent(
+            None, self.dumper.DEFAULT_MAPPING_TAG, True, flow_style=False))
+
+    def end_mapping(self):
+        self.emit(events.MappingEndEvent())
+
+    def start_sequence(self):
+        self.emit(events.SequenceStartEvent(
+            None, self.dumper.DEFAULT_SEQUENCE_TAG, True, flow_style=False))
+
+    def end_sequence(self):
+        self.emit(events.SequenceEndEvent())
+
+    def data(self, data):
+        """
+        Represent data and emit it, forgetting the objects represented afterwards.
+        """
+        dumper = self.dumper
+        node = dumper.represent_data(data)
+        dumper.represented_objects = {}
+        dumper.object_keeper = []
+        dumper.alias_key = None
+        anchors = {}
+        _find_anchors(node, anchors, set())
+        self.node(node, anchors, set())
+
+    def node(self, node, anchors, emitted):
+        anchor = None
+        if anchors:
+            if node in emitted:
+                self.emit(events.AliasEvent(anchors[node]))
+                return
+            emitted.add(node)
+            anchor = anchors.get(node)
+        tag = node.tag
+
+        if node.id == 'scalar':
+            self.emit(events.ScalarEvent(
+                anchor, tag, self.scalar_implicit(tag, node.value), node.value, style=node.style))
+        elif node.id == 'sequence':
+            self.emit(events.SequenceStartEvent(
+                anchor, tag, tag == self.dumper.DEFAULT_SEQUENCE_TAG, flow_style=node.flow_style))
+            for item in node.value:
+                self.node(item, anchors, emitted)
+            self.emit(events.SequenceEndEvent())
+        else:
+            self.emit(events.MappingStartEvent(
+                anchor, tag, tag == self.dumper.DEFAULT_MAPPING_TAG, flow_style=node.flow_style))
+            for key, value in node.value:
+                self.node(key, anchors, emitted)
+                self.node(value, anchors, emitted)
+            self.emit(events.MappingEndEvent())
+
+    def scalar_implicit(self, tag, value):
+        if len(value) > IMPLICIT_CACHE_VALUE_LENGTH:
+            return (tag == self.dumper.resolve(yaml.ScalarNode, value, (True, False)),
+                    tag == self.dumper.DEFAULT_SCALAR_TAG)
+
+        implicit = self.implicit.get((tag, value))
+        if implicit is None:
+            if len(self.implicit) >= IMPLICIT_CACHE_SIZE:
+                self.implicit.clear()
+            implicit = self.implicit[(tag, value)] = (
+                tag == self.dumper.resolve(yaml.ScalarNode, value, (True, False)),
+                tag == self.dumper.DEFAULT_SCALAR_TAG)
+        return implicit
+
+
+def dump_items(data, stream, serializer=PYTHON):
+    """
+    Dump data into stream like dump, one item at a time for the sequences of a mapping.
+
+    A single dumper emits the document, and each item of ``items`` and ``references``
+    is represented on its own, so memory is bounded by the largest item instead
+    of the whole file. The output is the same, as long as no object appears
+    in two items, which dump writes with an anchor and aliases.
+    """
+    dumper = DUMPERS[serializer](stream, default_flow_style=False)
+    emitter = _DocumentEmitter(dumper)
+    try:
+        emitter.start()
+        if not isinstance(data, dict):
+            emitter.data(data)
+        else:
+            emitter.start_mapping()
+            for key in sorted(data):
+                value = data[key]
+                emitter.data(key)
+                if isinstance(value, (list, _PickledItems)) and value:
+                    emitter.start_sequence()
+                    for item in value:
+                        emitter.data(item)
+                    emitter.end_sequence()
+                else:
+                    emitter.data(value)
+            emitter.end_mapping()
+        emitter.end()
+    finally:
+        dumper.dispose()
+
+
+class _HashingStream(object):
+    """
+    Text stream writing into a file while hashing what is written.
+    """
+
+    def __init__(self, file_obj):
+        self.file_obj = file_obj
+        self.content_hash = hashlib.sha1()
+
+    def write(self, text):
+        self.content_hash.update(text.encode('utf-8'))
+        self.file_obj.write(text)
+
+    def flush(self):
+        self.file_obj.flush()
+
+
+def write_yaml_file(path, data, header, serializer, old_hash=None):
+    """
+    Write data into the YAML file at path, starting with the YamlMime header if header is true,
+    and get the content hash of the file.
+
+    The file is written next to path and moved in place once done. If its content hash
+    is old_hash and path exists, it is discarded instead, so that path is left untouched.
+    """
+    ensuredir(os.path.dirname(path))
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'w') as out_file_obj:
+            stream = _HashingStream(out_file_obj)
+            if header:
+                stream.write(YAML_MIME)
+            try:
+                dump_items(data, stream, serializer=serializer)
+            except Exception as e:
+                raise ValueError("Unable to dump object\n{0}".format(data)) from e
+
+        content_hash = stream.content_hash.hexdigest()
+        if content_hash == old_hash and os.path.exists(path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return content_hash
+
+
+# Hashes of a YAML file, kept in the manifest of the build.
+# data is the hash of the data the file is dumped from, known before dumping it,
+# and content the hash of the text of the file.
+FileHashes = namedtuple('FileHashes', ['data', 'content'])
+
+
+def hash_data(data, header):
+    """
+    Get the data hash of a file dumped from data, with the YamlMime header if header is true.
+
+    data is pickled without memo, as the strings of the items are shared or not
+    depending on what was read and interned. Data equal in value has the same hash,
+    and the files dumped from it only differ by the anchors of objects found twice in an item.
+    """
+    data_hash = hashlib.sha1()
+    pickler = pickle.Pickler(_HashingFile(data_hash), pickle.HIGHEST_PROTOCOL)
+    pickler.fast = True
+    pickler.dump((header, data))
+    return data_hash.hexdigest()
+
+
+class _HashingFile(object):
+    """
+    Binary file hashing what is written without keeping it.
+
+    The pickler writes into it a frame at a time, so hashing
+    doesn't hold the whole pickle of a file.
+    """
+
+    def __init__(self, content_hash):
+        self.write = content_hash.update
+
+
+class _PickledItems(object):
+    """
+    Items of a sequence pickled one at a time, and unpickled one at a time when iterated.
+    """
+
+    def __init__(self, items):
+        self.items = [pickle.dumps(item, pickle.HIGHEST_PROTOCOL) for item in items]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        for item in self.items:
+            yield pickle.loads(item)
+
+
+def _copy_for_job(data):
+    """
+    Copy data for a worker process, each item of the sequences of a mapping pickled on its own.
+
+    dump_items dumps _PickledItems as sequences, so the worker only holds
+    one item of a sequence unpickled at a time.
+    """
+    if not isinstance(data, dict):
+        return copy.deepcopy(data)
+    return {
+        key: _PickledItems(value) if isinstance(value, list) and value else copy.deepcopy(value)
+        for key, value in data.items()
+    }
+
+
+# A YAML file to be written by a worker process.
+# data is copied by _copy_for_job when the job is created, so that the file content
+# doesn't depend on changes made to the merged objects afterwards.
+WriteJob = namedtuple('WriteJob', ['path', 'data', 'header', 'serializer', 'old_hash'])
+
+
+def _run_write_job(job):
+    return write_yaml_file(job.path, job.data, job.header, job.serializer, job.old_hash)
+
+
+class YamlFileWriter(object):
+    """
+    Write YAML files in this process, or with a pool of worker processes
+    when ``workers`` is more than 1.
+
+    Files are handed to the pool as they are written. At most two jobs per worker
+    wait to be written, :meth:`write` blocks until one of them is done,
+    so only the data of a few files is held copied at any time.
+    Call :meth:`close` to wait for all the files to be written, or :meth:`terminate`
+    to stop the worker processes without waiting when the files can't all be written.
+
+    The FileHashes of each file are kept in ``hashes``, keyed by path.
+    """
+
+    def __init__(self, serializer, workers=1):
+        self.serializer = serializer
+        self.workers = workers
+        self.pool = None
+        # (path, data hash, result) of the jobs not known to be done yet, oldest first
+        self.pending = deque()
+        self.hashes = {}
+
+    def write(self, path, data, header=True, old_hashes=None):
+        """
+        Write data into the YAML file at path, given the FileHashes of the file of the last build.
+
+        The file isn't dumped again if it exists and its data is unchanged, and isn't written
+        if the text dumped is unchanged.
+        """
+        data_hash = hash_data(data, header)
+        old_content_hash = None
+        if old_hashes is not None:
+            if old_hashes.data == data_hash and os.path.exists(path):
+                self.hashes[path] = old_hashes
+                return
+            old_content_hash = old_hashes.content
+
+        if self.workers <= 1:
+            self.hashes[path] = FileHashes(data_hash, write_yaml_file(
+                path, data, header, self.serializer, old_content_hash))
+            return
+
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers)
+        while len(self.pending) >= 2 * self.workers:
+            self._wait_one()
+        job = WriteJob(path, _copy_for_job(data), header, self.serializer, old_content_hash)
+        self.pending.append((path, data_hash, self.pool.apply_async(_run_write_job, (job,))))
+
+    def _wait_one(self):
+        path, data_hash, result = self.pending.popleft()
+        self.hashes[path] = FileHashes(data_hash, result.get())
+
+    def close(self):
+        """
+        Wait for the files to be written, and stop the worker processes.
+        """
+        if self.pool is None:
+            return
+        pool, self.pool = self.pool, None
+        try:
+            while self.pending:
+                self._wait_one()
+        except BaseException:
+            # Cancel the jobs left
+            pool.terminate()
+            raise
+        finally:
+            self.pending.clear()
+            pool.close()
+            pool.join()
+
+    def terminate(self):
+        """
+        Stop the worker processes, cancelling the files not written yet.
+        Does nothing once the writer is closed.
+        """
+        if self.pool is None:
+            return
+        pool, self.pool = self.pool, None
+        self.pending.clear()
+        pool.terminate()
+        pool.join()
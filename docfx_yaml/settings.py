@@ -3,7 +3,109 @@ Basic settings. You shouldn't need to touch this.
 """
 
 import os
+import re
+from collections import namedtuple
+
+from sphinx.errors import ExtensionError
 
 
 SITE_ROOT = os.path.dirname(os.path.realpath(__file__))
 API_ROOT = 'docfx_yaml'
+
+
+# The options of conf.py used while building the YAML files, see resolve_settings
+DocfxSettings = namedtuple('DocfxSettings', [
+    # NamespacePackageMatcher of namespace_package_dict, or None if it's empty
+    'namespace_packages',
+    'source_prefix',
+    'remove_inheritance_for_notfound_class',
+    # Number of processes writing the YAML files, from docfx_yaml_workers
+    'workers',
+])
+
+
+class NamespacePackageMatcher(object):
+    """
+    Find the friendly name of a package from the regex patterns of ``namespace_package_dict``.
+
+    The patterns are tried in order, like calling ``re.match`` with each of them.
+    They are compiled once, into a single alternation when none of them
+    has groups or flags that would change the meaning of the others,
+    and the result for each package name is kept.
+    """
+
+    def __init__(self, namespace_package_dict):
+        self.friendly_names = list(namespace_package_dict.values())
+        # Package name -> friendly name or None
+        self.cache = {}
+        patterns = [re.compile(name) for name in namespace_package_dict]
+        default_flags = re.compile('').flags
+
+        if all(pattern.groups == 0 and pattern.flags == default_flags for pattern in patterns):
+            self.combined = re.compile('|'.join(
+                '(?P<p{}>{})'.format(index, pattern.pattern)
+                for index, pattern in enumerate(patterns)))
+            self.patterns = None
+        else:
+            self.combined = None
+            self.patterns = patterns
+
+    def match(self, package_name):
+        """
+        Get the friendly name of the first pattern matching package_name, or None.
+        """
+        if package_name not in self.cache:
+            self.cache[package_name] = self._match(package_name)
+        return self.cache[package_name]
+
+    def _match(self, package_name):
+        if self.combined is not None:
+            match = self.combined.match(package_name)
+            if match is not None:
+                return self.friendly_names[int(match.lastgroup[1:])]
+            return None
+
+        for index, pattern in enumerate(self.patterns):
+            if pattern.match(package_name) is not None:
+                return self.friendly_names[index]
+        return None
+
+
+def _check_type(config, name, expected_type, type_name):
+    value = getattr(config, name)
+    if not isinstance(value, expected_type):
+        raise ExtensionError('{} should be {}, not {!r}'.format(name, type_name, value))
+    return value
+
+
+def resolve_settings(config):
+    """
+    Check the options of conf.py and get them as DocfxSettings.
+    """
+    namespace_package_dict = _check_type(config, 'namespace_package_dict', dict, 'a dict')
+    for name, friendly_name in namespace_package_dict.items():
+        if not isinstance(name, str) or not isinstance(friendly_name, str):
+            raise ExtensionError(
+                'namespace_package_dict should map package name patterns to names, '
+                'not {!r} to {!r}'.format(name, friendly_name))
+        try:
+            re.compile(name)
+        except re.error as e:
+            raise ExtensionError(
+                'Invalid pattern {!r} in namespace_package_dict: {}'.format(name, e))
+
+    workers = config.docfx_yaml_workers
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+        raise ExtensionError(
+            'docfx_yaml_workers should be a positive int, not {!r}'.format(workers))
+
+    namespace_packages = None
+    if namespace_package_dict:
+        namespace_packages = NamespacePackageMatcher(namespace_package_dict)
+
+    return DocfxSettings(
+        namespace_packages=namespace_packages,
+        source_prefix=_check_type(config, 'source_prefix', str, 'a string'),
+        remove_inheritance_for_notfound_class=bool(config.remove_inheritance_for_notfound_class),
+        workers=workers,
+    )
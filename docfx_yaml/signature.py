@@ -0,0 +1,134 @@
+# coding: utf-8
+
+"""
+This module is used to find the signatures written in the docstrings of
+callables without ``__text_signature__``, such as the ones made with pybind11.
+
+It finds the same ``name(arg: type = default, ...)`` signatures as the regular expression
+of :func:`docfx_yaml.extension.enumerate_extract_signature`. Instead of backtracking
+through up to ``max_args`` optional groups, the end of the argument list parsed from
+each position is remembered, so every position is parsed once per argument index.
+"""
+
+import re
+
+# The pieces of a signature, none of them backtracks
+CALL_PATTERN = re.compile(r'(?P<name>[a-zA-Z_]+) *\( *')
+PARAMETER_PATTERN = re.compile(r'[*a-zA-Z_]+')
+ANNOTATION_PATTERN = re.compile(r' *: *[a-zA-Z_.]+')
+DEFAULT_PATTERN = re.compile(r' *= *([^ ]+)')
+SEPARATOR_PATTERN = re.compile(r' *([,)]) *')
+# Where a default value can end, before a space, a comma or a closing parenthesis
+DEFAULT_END_PATTERN = re.compile(r'(?=[,)])|$')
+
+
+class SignatureParser(object):
+    """
+    Parse the signatures of a docstring, see :func:`parse_signatures`.
+    """
+
+    def __init__(self, doc, max_args=20):
+        self.doc = doc.replace('\n', ' ')
+        self.max_args = max_args
+        # (position, index of the previous argument) -> result of _parse_rest
+        self.rest_cache = {}
+
+    def parse_rest(self, pos, index):
+        """
+        Parse the end of an argument list at pos, following the argument at index:
+        either the closing parenthesis or a comma and the next arguments.
+
+        Returns:
+            tuple: The position after the closing parenthesis and the next arguments, or None.
+        """
+        key = (pos, index)
+        if key not in self.rest_cache:
+            self.rest_cache[key] = self._parse_rest(pos, index)
+        return self.rest_cache[key]
+
+    def _parse_rest(self, pos, index):
+        separator = SEPARATOR_PATTERN.match(self.doc, pos)
+        if separator is None:
+            return None
+        if separator.group(1) == ')':
+            # Spaces after the closing parenthesis aren't part of the signature
+            return separator.start(1) + 1, []
+        if index + 1 < self.max_args:
+            return self.parse_argument(separator.end(), index + 1)
+        return None
+
+    def parse_argument(self, pos, index):
+        """
+        Parse ``name[: type][= default]`` at pos and the rest of the argument list.
+
+        Returns:
+            tuple: The position after the closing parenthesis and the arguments
+            from this one, without their types, or None.
+        """
+        doc = self.doc
+        name = PARAMETER_PATTERN.match(doc, pos)
+        if name is None:
+            return None
+        end = name.end()
+        annotation = ANNOTATION_PATTERN.match(doc, end)
+        if annotation is not None:
+            end = annotation.end()
+
+        default = DEFAULT_PATTERN.match(doc, end)
+        if default is not None:
+            # The default value is the shortest run of characters other than
+            # spaces after which the argument list goes on.
+            value_start, value_end = default.span(1)
+            for default_end in DEFAULT_END_PATTERN.finditer(doc, value_start + 1, value_end):
+                rest = self.parse_rest(default_end.start(), index)
+                if rest is not None:
+                    # Keep the default with its equal sign, without the type
+                    equal_sign = default.start() + default.group().index('=')
+                    arg = name.group() + doc[equal_sign:default_end.start()]
+                    return rest[0], [arg] + rest[1]
+            return None
+
+        rest = self.parse_rest(end, index)
+        if rest is None:
+            return None
+        return rest[0], [name.group()] + rest[1]
+
+    def parse_arguments(self, pos):
+        """
+        Parse the argument list starting after the opening parenthesis at pos.
+
+        Returns:
+            tuple: The position after the closing parenthesis and the arguments, or None.
+        """
+        parsed = self.parse_argument(pos, 0)
+        if parsed is not None:
+            return parsed
+        # Without a first argument, the following ones are ignored
+        parsed = self.parse_rest(pos, 0)
+        if parsed is not None:
+            return parsed[0], []
+        return None
+
+    def __iter__(self):
+        pos = 0
+        while True:
+            call = CALL_PATTERN.search(self.doc, pos)
+            if call is None:
+                return
+            parsed = self.parse_arguments(call.end())
+            if parsed is None:
+                pos = call.end('name')
+            else:
+                yield call.group('name'), parsed[1]
+                pos = parsed[0]
+
+
+def parse_signatures(doc, max_args=20):
+    """
+    Find the signatures in a docstring.
+
+    Yields:
+        tuple: The name of the callable and its arguments, with their default
+        values but without their types, for each signature in doc.
+    """
+    return iter(SignatureParser(doc, max_args))
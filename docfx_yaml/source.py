@@ -0,0 +1,176 @@
+# coding: utf-8
+
+"""
+This module is used to find the line where the source of an object starts,
+like ``inspect.getsourcelines(obj)[1]`` but reading each source file once.
+
+``inspect`` searches the whole file again for each class, and tokenizes the
+source block of each object to return it. Here the class definitions of a file
+are indexed once, the way the running Python's ``inspect.findsource`` finds
+them, and functions start from the line of their code object, so no source
+block is ever tokenized.
+"""
+
+import re
+import sys
+import ast
+import inspect
+import linecache
+
+# From Python 3.9, inspect.findsource finds classes by __qualname__ in the AST,
+# and from Python 3.13 it reads the __firstlineno__ set by the compiler
+CLASSES_BY_QUALNAME = sys.version_info >= (3, 9)
+CLASSES_BY_FIRSTLINENO = sys.version_info >= (3, 13)
+
+# Same as the pattern of inspect.findsource for classes before Python 3.9, for any class name
+CLASS_PATTERN = re.compile(r'(\s*)class\s*(\w+)')
+NAME_PATTERN = re.compile(r'\w+$')
+# Pattern of inspect.findsource to find the first line of functions
+FUNCTION_PATTERN = re.compile(r'^(\s*def\s)|(\s*async\s+def\s)|(.*(?<!\w)lambda(:|\s))|^(\s*@)')
+
+
+class ClassIndexer(ast.NodeVisitor):
+    """
+    Index the class definitions of a module by qualified name, as inspect._ClassFinder finds them.
+    """
+
+    def __init__(self):
+        self.stack = []
+        # Class qualified name -> index of the line of its first definition
+        self.classes = {}
+
+    def visit_FunctionDef(self, node):
+        self.stack.append(node.name)
+        self.stack.append('<locals>')
+        self.generic_visit(node)
+        self.stack.pop()
+        self.stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.stack.append(node.name)
+        # A decorated class starts at its first decorator
+        if node.decorator_list:
+            line_number = node.decorator_list[0].lineno
+        else:
+            line_number = node.lineno
+        self.classes.setdefault('.'.join(self.stack), line_number - 1)
+        self.generic_visit(node)
+        self.stack.pop()
+
+
+class SourceFile(object):
+    """
+    The lines of a source file and the index of its class definitions.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        # Class qualified name -> line of its first definition, built on the first lookup
+        self.qualified_classes = None
+        # Class name -> line of its first definition at the top level
+        self.top_level_classes = None
+        # Class name -> (indentation, line) of its least indented definition
+        self.nested_classes = None
+
+    def index_qualified_classes(self):
+        indexer = ClassIndexer()
+        indexer.visit(ast.parse(''.join(self.lines)))
+        self.qualified_classes = indexer.classes
+
+    def index_classes(self):
+        self.top_level_classes = {}
+        self.nested_classes = {}
+
+        for index, line in enumerate(self.lines):
+            match = CLASS_PATTERN.match(line)
+            if match is None:
+                continue
+            name = match.group(2)
+            if line[0] == 'c':
+                self.top_level_classes.setdefault(name, index)
+            else:
+                candidate = (match.group(1), index)
+                self.nested_classes[name] = min(self.nested_classes.get(name, candidate), candidate)
+
+    def class_line(self, cls):
+        """
+        Get the index of the line where the class cls is defined, as inspect.findsource.
+        """
+        if CLASSES_BY_QUALNAME:
+            if self.qualified_classes is None:
+                self.index_qualified_classes()
+            if cls.__qualname__ in self.qualified_classes:
+                return self.qualified_classes[cls.__qualname__]
+            raise OSError('could not find class definition')
+
+        if self.top_level_classes is None:
+            self.index_classes()
+        if cls.__name__ in self.top_level_classes:
+            return self.top_level_classes[cls.__name__]
+        if cls.__name__ in self.nested_classes:
+            return self.nested_classes[cls.__name__][1]
+        raise OSError('could not find class definition')
+
+    def function_line(self, code):
+        """
+        Get the index of the line where the function of code starts, as inspect.findsource.
+        """
+        lnum = code.co_firstlineno - 1
+        while lnum > 0:
+            if FUNCTION_PATTERN.match(self.lines[lnum]):
+                break
+            lnum = lnum - 1
+        return lnum
+
+
+class SourceLines(object):
+    """
+    Find where the source of objects starts, reading each source file once.
+    """
+
+    def __init__(self):
+        # Source file path -> SourceFile
+        self.files = {}
+
+    def get_file(self, obj, file):
+        if file not in self.files:
+            linecache.checkcache(file)
+            module = inspect.getmodule(obj, file)
+            if module:
+                lines = linecache.getlines(file, module.__dict__)
+            else:
+                lines = linecache.getlines(file)
+            if not lines:
+                raise OSError('could not get source code')
+            self.files[file] = SourceFile(lines)
+        return self.files[file]
+
+    def start_line(self, obj):
+        """
+        Get the line number where the source of obj starts, as ``inspect.getsourcelines(obj)[1]``.
+        """
+        obj = inspect.unwrap(obj)
+        file = inspect.getsourcefile(obj)
+        function = obj.__func__ if inspect.ismethod(obj) else obj
+
+        if file and inspect.ismodule(obj):
+            self.get_file(obj, file)
+            return 0
+        if file and inspect.isclass(obj) and CLASSES_BY_FIRSTLINENO:
+            source_file = self.get_file(obj, file)
+            first_line = vars(obj).get('__firstlineno__')
+            if first_line is None:
+                raise OSError('source code not available')
+            if first_line > len(source_file.lines):
+                raise OSError('lineno is out of bounds')
+            return first_line
+        if file and inspect.isclass(obj) and (
+                CLASSES_BY_QUALNAME or NAME_PATTERN.match(obj.__name__)):
+            return self.get_file(obj, file).class_line(obj) + 1
+        if file and inspect.isfunction(function):
+            return self.get_file(obj, file).function_line(function.__code__) + 1
+
+        # Other objects, sources without a file, or class names which aren't valid in a regex
+        return inspect.getsourcelines(obj)[1]
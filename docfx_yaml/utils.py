@@ -1,12 +1,15 @@
 import re
-from docutils.io import StringOutput
+from docutils.frontend import OptionParser
 from docutils.utils import new_document
 from docutils import nodes
 from inspect import signature
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
 from .writer import MarkdownWriter as Writer
 
+# Template of the documents holding the nodes to transform, see _new_partial_document
+_partial_document = None
+
 
 def slugify(value):
     """
@@ -28,15 +31,93 @@ def transform_string(app, string):
     return '\n\n'.join(ret)
 
 
+def _new_partial_document():
+    """
+    Get a new empty document to hold a node to transform.
+
+    Building the default settings of a document is slow, so documents are
+    copied from a template made once. Copies share its settings and reporter.
+    """
+    global _partial_document
+    if _partial_document is None:
+        settings = OptionParser().get_default_values()
+        _partial_document = new_document(b'<partial node>', settings)
+    return _partial_document.copy()
+
+
+def _acquire_writer(app):
+    """
+    Get an idle writer of the app's builder, or a new one if all are in use.
+    Give it back with _release_writer once done.
+
+    Idle writers are kept in app.docfx_writer_pool, set in build_init,
+    so they don't outlive the app and the builder they hold.
+    """
+    if app.docfx_writer_pool:
+        return app.docfx_writer_pool.pop()
+    return Writer(app.builder)
+
+
+def _release_writer(app, writer):
+    app.docfx_writer_pool.append(writer)
+
+
 def transform_node(app, node):
-    destination = StringOutput(encoding='utf-8')
-    doc = new_document(b'<partial node>')
+    doc = _new_partial_document()
     doc.append(node)
 
     # Resolve refs
     doc['docname'] = 'inmemory'
     app.env.resolve_references(doctree=doc, fromdocname='inmemory', builder=app.builder)
 
-    writer = Writer(app.builder)
-    writer.write(doc, destination)
-    return destination.destination.decode('utf-8')
+    writer = _acquire_writer(app)
+    try:
+        return writer.translate_document(doc)
+    finally:
+        _release_writer(app, writer)
+
+
+class ReferenceSet(object):
+    """
+    References of docfx YAML data, keyed on their uid.
+
+    References keep the order they are added in. Adding a reference
+    whose uid is already in the set keeps the first one.
+    """
+
+    def __init__(self, references=()):
+        self._references = OrderedDict()
+        self.extend(references)
+
+    def append(self, reference):
+        self._references.setdefault(reference['uid'], reference)
+
+    def extend(self, references):
+        for reference in references:
+            self.append(reference)
+
+    def __contains__(self, uid):
+        return uid in self._references
+
+    def __iter__(self):
+        return iter(self._references.values())
+
+    def __len__(self):
+        return len(self._references)
+
+    def __repr__(self):
+        return 'ReferenceSet({!r})'.format(list(self))
+
+
+def get_doc_data(env):
+    """
+    Get the docfx data owned by the document currently being read.
+
+    Everything extracted while reading is stored per docname,
+    so that it can be purged and merged for incremental and parallel builds.
+    """
+    return env.docfx_doc_data.setdefault(env.docname, {
+        'objects': [],
+        'info_field_data': {},
+        'signatures': {},
+    })
@@ -40,6 +40,29 @@ class bcolors:
 
 
 
+NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7f]')
+# Character -> its column width, filled as non-ASCII characters are met
+_char_widths = {}
+
+
+def char_width(char):
+    """Get the column width of a character, as docutils' column_width."""
+    width = _char_widths.get(char)
+    if width is None:
+        width = _char_widths[char] = column_width(char)
+    return width
+
+
+def text_width(text):
+    """Get the column width of text, as docutils' column_width.
+
+    ASCII characters are one column wide, so ASCII text is measured with len().
+    """
+    if NON_ASCII_PATTERN.search(text) is None:
+        return len(text)
+    return sum(map(char_width, text))
+
+
 class TextWrapper(textwrap.TextWrapper):
     """Custom subclass that uses a different word separator regex."""
 
@@ -71,13 +94,13 @@ class TextWrapper(textwrap.TextWrapper):
             else:
                 indent = self.initial_indent
 
-            width = self.width - column_width(indent)
+            width = self.width - text_width(indent)
 
             if drop_whitespace and chunks[-1].strip() == '' and lines:
                 del chunks[-1]
 
             while chunks:
-                l = column_width(chunks[-1])
+                l = text_width(chunks[-1])
 
                 if cur_len + l <= width:
                     cur_line.append(chunks.pop())
@@ -86,7 +109,7 @@ class TextWrapper(textwrap.TextWrapper):
                 else:
                     break
 
-            if chunks and column_width(chunks[-1]) > width:
+            if chunks and text_width(chunks[-1]) > width:
                 self._handle_long_word(chunks, cur_line, cur_len, width)
 
             if drop_whitespace and cur_line and cur_line[-1].strip() == '':
@@ -102,9 +125,14 @@ class TextWrapper(textwrap.TextWrapper):
 
         Break line by unicode width instead of len(word).
         """
+        if NON_ASCII_PATTERN.search(word) is None:
+            if len(word) > space_left:
+                return word[:space_left-1], word[space_left-1:]
+            return word, ''
+
         total = 0
         for i, c in enumerate(word):
-            total += column_width(c)
+            total += char_width(c)
             if total > space_left:
                 return word[:i-1], word[i-1:]
         return word, ''
@@ -119,7 +147,11 @@ class TextWrapper(textwrap.TextWrapper):
             return textwrap.TextWrapper._split(self, t)
         chunks = []
         for chunk in split(text):
-            for w, g in groupby(chunk, column_width):
+            if NON_ASCII_PATTERN.search(chunk) is None:
+                # All the characters are one column wide
+                chunks.extend(split(chunk))
+                continue
+            for w, g in groupby(chunk, char_width):
                 if w == 1:
                     chunks.extend(split(''.join(g)))
                 else:
@@ -152,6 +184,16 @@ def my_wrap(text, width=MAXWIDTH, **kwargs):
     return w.wrap(text)
 
 
+def get_newline(config):
+    newlines = config.text_newlines
+    if newlines == 'windows':
+        return '\r\n'
+    elif newlines == 'native':
+        return os.linesep
+    else:
+        return '\n'
+
+
 class MarkdownWriter(writers.Writer):
     """
     This writer is used to produce the markdown
@@ -168,11 +210,31 @@ class MarkdownWriter(writers.Writer):
         writers.Writer.__init__(self)
         self.builder = builder
         self.translator_class = MarkdownTranslator
+        self.visitor = None
+        self.fast_translator = FastTranslator(builder)
 
     def translate(self):
-        visitor = self.translator_class(self.document, self.builder)
-        self.document.walkabout(visitor)
-        self.output = visitor.body
+        # Most documents are only made of the nodes FastTranslator renders
+        if self.translator_class is MarkdownTranslator:
+            self.output = self.fast_translator.translate(self.document)
+            if self.output is not None:
+                return
+
+        # The translator is reused for every document written by this writer
+        if self.visitor is None:
+            self.visitor = self.translator_class(self.document, self.builder)
+        else:
+            self.visitor.reset(self.document)
+        self.visitor.walkabout(self.document)
+        self.output = self.visitor.body
+
+    def translate_document(self, document):
+        """
+        Translate a document and return the markdown, without writing it to a destination.
+        """
+        self.document = document
+        self.translate()
+        return self.output
 
 
 class MarkdownTranslator(nodes.NodeVisitor):
@@ -180,18 +242,18 @@ class MarkdownTranslator(nodes.NodeVisitor):
     xref_template = "<xref:{0}>"
 
     def __init__(self, document, builder):
-        self.invdata = []
-        nodes.NodeVisitor.__init__(self, document)
         self.builder = builder
-
-        newlines = builder.config.text_newlines
-        if newlines == 'windows':
-            self.nl = '\r\n'
-        elif newlines == 'native':
-            self.nl = os.linesep
-        else:
-            self.nl = '\n'
+        self.nl = get_newline(builder.config)
         self.sectionchars = builder.config.text_sectionchars
+        self.dispatch_table = self.get_dispatch_table()
+        self.reset(document)
+
+    def reset(self, document):
+        """
+        Reset the translation state, to translate another document.
+        """
+        self.invdata = []
+        nodes.NodeVisitor.__init__(self, document)
         self.states = [[]]
         self.stateindent = [0]
         self.list_counter = []
@@ -199,6 +261,109 @@ class MarkdownTranslator(nodes.NodeVisitor):
         self.lineblocklevel = 0
         self.table = None
 
+    @classmethod
+    def get_dispatch_table(cls):
+        """
+        Get the (visit, depart) functions of each node class name,
+        looked up once per translator class rather than for each node.
+        """
+        # Read from the class itself, subclasses have tables of their own
+        table = cls.__dict__.get('_dispatch_table')
+        if table is None:
+            names = set(
+                attribute.split('_', 1)[1] for attribute in dir(cls)
+                if attribute.startswith(('visit_', 'depart_'))
+            )
+            table = {
+                name: (getattr(cls, 'visit_' + name, cls.unknown_visit),
+                       getattr(cls, 'depart_' + name, cls.unknown_departure))
+                for name in names
+            }
+            cls._dispatch_table = table
+        return table
+
+    def _get_methods(self, node):
+        methods = self.dispatch_table.get(node.__class__.__name__)
+        if methods is None:
+            return type(self).unknown_visit, type(self).unknown_departure
+        return methods
+
+    def dispatch_visit(self, node):
+        return self._get_methods(node)[0](self, node)
+
+    def dispatch_departure(self, node):
+        return self._get_methods(node)[1](self, node)
+
+    def walkabout(self, node):
+        """
+        Walk the tree of node as ``node.walkabout(self)`` does, but with a stack
+        of the nodes being walked instead of recursive calls.
+        """
+        # [node, children left to walk in reverse order, call depart, stop] of the nodes being walked
+        stack = []
+        to_visit = node
+        while True:
+            # What the walk of the last node returned to its parent: stop or an exception
+            stop = False
+            raised = None
+
+            if to_visit is not None:
+                frame = [to_visit, [], True, False]
+                try:
+                    try:
+                        self.dispatch_visit(to_visit)
+                    except nodes.SkipNode:
+                        frame = None
+                    except nodes.SkipDeparture:
+                        frame[2] = False
+                    if frame is not None:
+                        frame[1] = to_visit.children[::-1]
+                except nodes.SkipChildren:
+                    pass
+                except nodes.StopTraversal:
+                    frame[3] = True
+                except Exception as e:
+                    raised = e
+                    frame = None
+                to_visit = None
+                if frame is not None:
+                    stack.append(frame)
+                    continue
+            else:
+                frame = stack[-1]
+                if frame[1]:
+                    to_visit = frame[1].pop()
+                    continue
+                stack.pop()
+                stop = frame[3]
+                if frame[2]:
+                    try:
+                        self.dispatch_departure(frame[0])
+                    except Exception as e:
+                        raised = e
+
+            # Return to the parents
+            while stack:
+                parent = stack[-1]
+                if raised is None:
+                    if stop:
+                        parent[1] = []
+                        parent[3] = True
+                    break
+                if isinstance(raised, (nodes.SkipSiblings, nodes.SkipChildren)):
+                    parent[1] = []
+                    break
+                if isinstance(raised, nodes.StopTraversal):
+                    parent[1] = []
+                    parent[3] = True
+                    break
+                # The walk of the parent is interrupted too
+                stack.pop()
+            else:
+                if raised is not None:
+                    raise raised
+                return stop
+
     @staticmethod
     def resolve_reference_in_node(node):
         if node.tagname == 'reference':
@@ -217,6 +382,19 @@ class MarkdownTranslator(nodes.NodeVisitor):
                 if isinstance(child, Node):
                     MarkdownTranslator.resolve_reference_in_node(child)
 
+    @staticmethod
+    def _alert_box_text(node):
+        """
+        Get the text of node as resolve_reference_in_node then astext would,
+        in one walk and without replacing the reference nodes.
+        """
+        if node.tagname == 'reference':
+            return MarkdownTranslator._reference_target(node)[0]
+        if isinstance(node, nodes.Element) and type(node).astext is nodes.Element.astext:
+            return node.child_text_separator.join(
+                MarkdownTranslator._alert_box_text(child) for child in node.children)
+        return node.astext()
+
     def add_text(self, text):
         self.states[-1].append((-1, text))
 
@@ -684,7 +862,10 @@ class MarkdownTranslator(nodes.NodeVisitor):
             self.end_state(first='%s. ' % self.list_counter[-1])
 
     def visit_definition_list_item(self, node):
-        self._classifier_count_in_li = len(node.traverse(nodes.classifier))
+        # Only the classifiers of this item's term, not those of nested definition lists,
+        # which would leave the state of the term open
+        self._classifier_count_in_li = len([
+            child for child in node.children if isinstance(child, nodes.classifier)])
 
     def depart_definition_list_item(self, node):
         pass
@@ -774,34 +955,29 @@ class MarkdownTranslator(nodes.NodeVisitor):
             self.end_state(first=admonitionlabels[name] + ': ')
         return depart_admonition
 
-    def _make_depart_alert_box(name):
-        def depart_alert_box(self, node):
-            self.clear_last_state()
-            MarkdownTranslator.resolve_reference_in_node(node)
-            lines = node.astext().split('\n')
+    def _make_visit_alert_box(name):
+        def visit_alert_box(self, node):
+            # Rendered from the text of the node, the children aren't visited
+            lines = MarkdownTranslator._alert_box_text(node).split('\n')
             quoteLines = ['> {0}\n>'.format(line) for line in lines]
             mdStr = '\n> [!{0}]\n{1}'.format(name, '\n'.join(quoteLines))
             self.add_text(mdStr)
-        return depart_alert_box
+            raise nodes.SkipNode
+        return visit_alert_box
 
     visit_attention = _visit_admonition
     depart_attention = _make_depart_admonition('attention')
-    visit_caution = _visit_admonition
-    depart_caution = _make_depart_alert_box('CAUTION')
+    visit_caution = _make_visit_alert_box('CAUTION')
     visit_danger = _visit_admonition
     depart_danger = _make_depart_admonition('danger')
     visit_error = _visit_admonition
     depart_error = _make_depart_admonition('error')
     visit_hint = _visit_admonition
     depart_hint = _make_depart_admonition('hint')
-    visit_important = _visit_admonition
-    depart_important = _make_depart_alert_box('IMPORTANT')
-    visit_note = _visit_admonition
-    depart_note = _make_depart_alert_box('NOTE')
-    visit_tip = _visit_admonition
-    depart_tip = _make_depart_alert_box('TIP')
-    visit_warning = _visit_admonition
-    depart_warning = _make_depart_alert_box('WARNING')
+    visit_important = _make_visit_alert_box('IMPORTANT')
+    visit_note = _make_visit_alert_box('NOTE')
+    visit_tip = _make_visit_alert_box('TIP')
+    visit_warning = _make_visit_alert_box('WARNING')
     visit_seealso = _visit_admonition
 
     def depart_seealso(self, node):
@@ -928,14 +1104,27 @@ class MarkdownTranslator(nodes.NodeVisitor):
 
     @classmethod
     def _resolve_reference(cls, node):
+        ref_string, refuri = cls._reference_target(node)
+        if refuri is not None:
+            node.attributes['refuri'] = refuri
+        return ref_string
+
+    @classmethod
+    def _reference_target(cls, node):
+        """
+        Get the markdown of a reference node, and its new refuri if it is
+        to be changed as done by _resolve_reference, without changing the node.
+        """
         ref_string = None
+        new_refuri = None
         raw_ref_tilde_template = ":class:`~{0}`"
         raw_ref_template = ":class:`{0}`"
         if 'refid' in node.attributes:
             ref_string = cls.xref_template.format(node.attributes['refid'])
         elif 'refuri' in node.attributes:
-            if 'http' in node.attributes['refuri'] or node.attributes['refuri'][0] == '/':
-                ref_string = '[{}]({})'.format(node.astext(), node.attributes['refuri'])
+            refuri = node.attributes['refuri']
+            if 'http' in refuri or refuri[0] == '/':
+                ref_string = '[{}]({})'.format(node.astext(), refuri)
             else:
                 # only use id in class and func refuri if its id exists
                 # otherwise, remove '.html#' in refuri
@@ -943,23 +1132,23 @@ class MarkdownTranslator(nodes.NodeVisitor):
                 # case 0 - [module]#[class-uid] (go to if block to use class-uid instead)
                 # case 1 - [module]#module-[module] (go to else block to remove '.html#' in refuri)
                 # case 2 - [class]# (go to else block to remove path and '.html#' in refuri)
-                uri_fields = node.attributes['refuri'].split('#')
+                uri_fields = refuri.split('#')
                 if len(uri_fields) > 1 and uri_fields[1] and not uri_fields[1].startswith('module'):
-                    node.attributes['refuri'] = uri_fields[1]
+                    refuri = new_refuri = uri_fields[1]
                 else:
-                    fname = os.path.split(node.attributes['refuri'])[-1]
+                    fname = os.path.split(refuri)[-1]
                     pos = fname.find('.html')
                     if pos != -1:
-                        node.attributes['refuri'] = fname[0: pos]
+                        refuri = new_refuri = fname[0: pos]
                 
-                if node.parent.rawsource == raw_ref_tilde_template.format(node.attributes['refuri']) or node.parent.rawsource == raw_ref_template.format(node.attributes['refuri']) or node.parent.tagname == 'document':
-                    ref_string = node.attributes['refuri']
+                if node.parent.rawsource == raw_ref_tilde_template.format(refuri) or node.parent.rawsource == raw_ref_template.format(refuri) or node.parent.tagname == 'document':
+                    ref_string = refuri
                 else:
-                    ref_string = cls.xref_template.format(node.attributes['refuri'])
+                    ref_string = cls.xref_template.format(refuri)
         else:
             ref_string = '{}<!-- {} -->'.format(node.tagname, json.dumps(node.attributes))
 
-        return ref_string
+        return ref_string, new_refuri
 
     def visit_reference(self, node):
         ref_string = MarkdownTranslator._resolve_reference(node)
@@ -1112,4 +1301,150 @@ class MarkdownTranslator(nodes.NodeVisitor):
     depart_remarks = remarks.depart_remarks
 
     def unknown_visit(self, node):
-        raise NotImplementedError('Unknown node: ' + node.__class__.__name__)
\ No newline at end of file
+        raise NotImplementedError('Unknown node: ' + node.__class__.__name__)
+
+
+class FastTranslator(object):
+    """
+    Render documents made of paragraphs, simple lists and common inline nodes
+    the same as MarkdownTranslator, in one pass and without its states.
+
+    :meth:`translate` returns None as soon as it meets another node,
+    or a list item holding anything else than paragraphs, and the document
+    is then left unchanged for MarkdownTranslator.
+    """
+
+    # Markup added around the content of these nodes by MarkdownTranslator
+    inline_markup = {
+        'emphasis': '*',
+        'literal_emphasis': '*',
+        'strong': '**',
+        'literal_strong': '**',
+        'literal': '`',
+    }
+
+    def __init__(self, builder):
+        self.nl = get_newline(builder.config)
+
+    def translate(self, document):
+        """
+        Get the markdown of document, or None if it has other nodes.
+        """
+        # (indentation, lines) of the paragraphs and list items in output order
+        blocks = []
+        # Text added to the document itself, formatted once followed by a paragraph or list
+        texts = []
+        # (node, refuri) of the references, changed once the document is rendered
+        references = []
+
+        for node in document.children:
+            name = node.__class__.__name__
+            if name == 'paragraph':
+                node_blocks = self._paragraph(node, 0, references)
+            elif name in ('bullet_list', 'enumerated_list'):
+                node_blocks = self._list(node, references)
+            elif self._add_inline([node], texts, references):
+                continue
+            else:
+                node_blocks = None
+
+            if node_blocks is None:
+                return None
+            if node_blocks:
+                self._add_texts(blocks, texts)
+                texts = []
+                blocks.extend(node_blocks)
+        self._add_texts(blocks, texts)
+
+        for node, refuri in references:
+            node.attributes['refuri'] = refuri
+        return self.nl.join(line and (' '*indent + line)
+                            for indent, lines in blocks
+                            for line in lines)
+
+    @staticmethod
+    def _add_texts(blocks, texts):
+        if texts:
+            blocks.append((0, ''.join(texts).splitlines() + ['']))
+
+    def _add_inline(self, children, texts, references):
+        """
+        Add the text of inline nodes to texts, return False if there are other nodes.
+        """
+        for node in children:
+            name = node.__class__.__name__
+            if name == 'Text':
+                texts.append(node.astext())
+            elif name in self.inline_markup:
+                markup = self.inline_markup[name]
+                texts.append(markup)
+                if not self._add_inline(node.children, texts, references):
+                    return False
+                texts.append(markup)
+            elif name == 'pending_xref':
+                if node.get('refdomain') == 'py':
+                    texts.append('<xref:{}>'.format(node.attributes['reftarget']))
+            elif name == 'reference':
+                ref_string, refuri = MarkdownTranslator._reference_target(node)
+                if refuri is not None:
+                    references.append((node, refuri))
+                texts.append(ref_string)
+            elif name == 'inline':
+                starred = 'xref' in node['classes'] or 'term' in node['classes']
+                if starred:
+                    texts.append('*')
+                if not self._add_inline(node.children, texts, references):
+                    return False
+                if starred:
+                    texts.append('*')
+            else:
+                return False
+        return True
+
+    def _paragraph(self, node, indent, references):
+        """
+        Get the blocks of a paragraph, or None if it has other nodes.
+        """
+        texts = []
+        if not self._add_inline(node.children, texts, references):
+            return None
+        if not texts:
+            return []
+        return [(indent, ''.join(texts).splitlines() + [''])]
+
+    def _list(self, node, references):
+        """
+        Get the blocks of a list whose items only hold paragraphs, or None.
+        """
+        blocks = []
+        # Same as the list counter of MarkdownTranslator
+        counter = -1 if node.__class__.__name__ == 'bullet_list' else node.get('start', 1) - 1
+        for item in node.children:
+            if item.__class__.__name__ != 'list_item':
+                return None
+            if counter == -1:
+                indent, first = 2, '* '
+            elif counter == -2:
+                # Definition list items
+                return None
+            else:
+                counter += 1
+                indent, first = len(str(counter)) + 2, '%s. ' % counter
+
+            item_blocks = []
+            for paragraph in item.children:
+                if paragraph.__class__.__name__ != 'paragraph':
+                    return None
+                paragraph_blocks = self._paragraph(paragraph, indent, references)
+                if paragraph_blocks is None:
+                    return None
+                item_blocks.extend(paragraph_blocks)
+
+            if item_blocks:
+                # Prefix the first line of the item as MarkdownTranslator.end_state
+                _indent, lines = item_blocks[0]
+                first_lines = (first + ' '.join(lines)).splitlines() + ['']
+                blocks.append((0, first_lines[:1]))
+                blocks.append((indent, first_lines[1:]))
+                blocks.extend(item_blocks[1:])
+        return blocks
@@ -1,29 +1,86 @@
 import os
+import json
+import pickle
 import re
 import yaml
 import shutil
+import sys
+import tempfile
 import unittest
 
 from contextlib import contextmanager
+from io import StringIO
+from types import SimpleNamespace
 
+import sphinx
 from sphinx.application import Sphinx
+from sphinx.environment import BuildEnvironment
+from sphinx.util.parallel import ParallelTasks, parallel_available
+
+# Sphinx < 1.6 keeps polling the pipes of finished parallel tasks. From Python 3.7
+# (bpo-30775) started processes drop their arguments, which close the sending end
+# of their pipe, so polling it raises EOFError.
+PARALLEL_TASKS_NEED_WORKAROUND = sphinx.version_info < (1, 6) and sys.version_info >= (3, 7)
+
+
+def create_app(confoverrides=None, parallel=0):
+    return Sphinx(
+        srcdir='./doc',
+        confdir='./doc',
+        outdir='_build/text',
+        doctreedir='_build/.doctrees',
+        buildername='html',
+        confoverrides=confoverrides,
+        parallel=parallel
+    )
+
+
+def read_output(path):
+    """ Read all the output files of a build.
+    """
+    output = {}
+    for file_name in os.listdir(path):
+        with open(os.path.join(path, file_name), 'r') as f:
+            output[file_name] = f.read()
+    return output
+
+
+@contextmanager
+def parallel_tasks_workaround():
+    """ Drop the pipes of finished tasks of ParallelTasks, where Sphinx polls them after they end.
+    """
+    if not PARALLEL_TASKS_NEED_WORKAROUND:
+        yield
+        return
+    tasks = ParallelTasks(1)
+    if not (hasattr(tasks, '_join_one') and hasattr(tasks, '_precvs')
+            and hasattr(tasks, '_result_funcs')):
+        raise unittest.SkipTest('ParallelTasks of this Sphinx version cannot be worked around')
+
+    join_one = ParallelTasks._join_one
+
+    def join_one_dropping_finished(tasks):
+        join_one(tasks)
+        for tid in list(tasks._precvs):
+            if tid not in tasks._result_funcs:
+                del tasks._precvs[tid]
+
+    ParallelTasks._join_one = join_one_dropping_finished
+    try:
+        yield
+    finally:
+        ParallelTasks._join_one = join_one
 
 
 @contextmanager
-def sphinx_build(test_dir):
+def sphinx_build(test_dir, confoverrides=None):
     """ Use contextmanager to ensure build cleaning after testing.
     """
 
     os.chdir('tests/{0}'.format(test_dir))
 
     try:
-        app = Sphinx(
-            srcdir='./doc',
-            confdir='./doc',
-            outdir='_build/text',
-            doctreedir='_build/.doctrees',
-            buildername='html'
-        )
+        app = create_app(confoverrides)
         app.build(force_all=True)
         yield
     finally:
@@ -518,3 +575,1031 @@ class YamlTests(unittest.TestCase):
                             item['type'],
                             'attribute'
                         )  # Test enum value type
+
+    def test_incremental_read(self):
+        """
+        Test objects of documents not re-read are kept in incremental builds.
+        """
+        with sphinx_build('example'):
+            full_output = read_output(self.build_path)
+
+            # Make sure only one document is outdated
+            mtime = os.path.getmtime('doc/format.rst.rst')
+            os.utime('doc/format.rst.rst', (mtime + 10, mtime + 10))
+            try:
+                app = create_app()
+                app.build()
+            finally:
+                os.utime('doc/format.rst.rst', (mtime, mtime))
+
+            self.assertEqual(
+                full_output,
+                read_output(self.build_path)
+            )
+
+    def test_parallel_read(self):
+        """
+        Test reading documents in parallel gives the same output as a serial build.
+        """
+        if not parallel_available:
+            self.skipTest('Sphinx cannot read in parallel on this platform')
+
+        with sphinx_build('example'):
+            serial_output = read_output(self.build_path)
+            shutil.rmtree('_build')
+
+            read_parallel = BuildEnvironment._read_parallel
+            calls = []
+
+            def recording_read_parallel(env, *args, **kwargs):
+                calls.append(args)
+                return read_parallel(env, *args, **kwargs)
+
+            BuildEnvironment._read_parallel = recording_read_parallel
+            try:
+                with parallel_tasks_workaround():
+                    app = create_app(parallel=2)
+                    app.build(force_all=True)
+            finally:
+                BuildEnvironment._read_parallel = read_parallel
+
+            self.assertTrue(calls)  # Test documents were read in parallel
+            self.assertEqual(
+                serial_output,
+                read_output(self.build_path)
+            )
+
+    def test_unchanged_files_not_rewritten(self):
+        """
+        Test YAML files are only dumped when their data changes, and written when their content changes.
+        """
+        from docfx_yaml import serializer
+
+        with sphinx_build('example'):
+            for file_name in os.listdir(self.build_path):
+                os.utime(os.path.join(self.build_path, file_name), (0, 0))
+
+            # Add a file written by a former build for an object which doesn't exist anymore
+            stale_file = os.path.join(self.build_path, 'format.rst.removed.yml')
+            with open(stale_file, 'w') as f:
+                f.write('### YamlMime:UniversalReference\n')
+            manifest_file = os.path.join('_build/.doctrees', 'docfx_yaml_manifest.json')
+            with open(manifest_file, 'r') as f:
+                manifest = json.load(f)
+            manifest['files']['format.rst.removed'] = ['', '']
+            # As if the data of a file changed, without changing its content
+            manifest['files']['format.rst.foo'][0] = ''
+            with open(manifest_file, 'w') as f:
+                json.dump(manifest, f)
+
+            dumped = []
+            dump_items = serializer.dump_items
+
+            def recording_dump_items(data, stream, serializer):
+                dumped.append(data['items'][0]['uid'])
+                return dump_items(data, stream, serializer)
+
+            serializer.dump_items = recording_dump_items
+            try:
+                app = create_app()
+                app.build(force_all=True)
+            finally:
+                serializer.dump_items = dump_items
+
+            self.assertEqual(
+                ['format.rst.foo'],
+                dumped
+            )  # Test only the file whose data hash changed is dumped
+            self.assertFalse(os.path.exists(stale_file))
+            for file_name in os.listdir(self.build_path):
+                self.assertEqual(
+                    0,
+                    os.path.getmtime(os.path.join(self.build_path, file_name))
+                )
+
+    def test_serializer(self):
+        """
+        Test the default python backend outputs the same text as yaml.safe_dump,
+        and auto, libyaml where it's installed, the same YAML data.
+        """
+        with sphinx_build('example'):
+            default_output = read_output(self.build_path)
+
+            app = create_app({'docfx_yaml_serializer': 'auto'})
+            app.build(force_all=True)
+            auto_output = read_output(self.build_path)
+
+            self.assertEqual(
+                sorted(default_output),
+                sorted(auto_output)
+            )
+            for file_name, content in default_output.items():
+                data = yaml.safe_load(content)
+                header = '### YamlMime:UniversalReference\n' if content.startswith('###') else ''
+                self.assertEqual(
+                    header + yaml.safe_dump(data, default_flow_style=False),
+                    content
+                )  # Test the default output is unchanged
+
+                self.assertEqual(
+                    yaml.safe_load(auto_output[file_name]),
+                    data
+                )  # Test the auto backend outputs the same data
+
+    def test_dump_items(self):
+        """
+        Test dumping one item at a time with a single dumper gives the same text as yaml.dump.
+        """
+        from docfx_yaml.serializer import dump, dump_items, DUMPERS, _copy_for_job
+
+        shared = {'uid': 'shared'}
+        cases = [
+            {
+                'items': [
+                    {'uid': 'a', 'summary': 'Multi\nline', 'isExternal': False, 'children': []},
+                    {'uid': 'b', 'startLine': 1, 'value': None, 'syntax': {'a': shared, 'b': shared}},
+                ],
+                'references': [{'uid': 'yes', 'name': '1.5'}, {'uid': '', 'name': 'a: b'}],
+                'api_name': [],
+                'empty': {},
+            },
+            [{'uid': 'a'}, 'text'],
+            {},
+        ]
+        for serializer in DUMPERS:
+            if DUMPERS[serializer] is None:
+                continue
+            for data in cases:
+                stream = StringIO()
+                dump_items(data, stream, serializer=serializer)
+                self.assertEqual(
+                    dump(data, serializer=serializer),
+                    stream.getvalue()
+                )
+
+                stream = StringIO()
+                job_data = pickle.loads(pickle.dumps(_copy_for_job(data)))
+                dump_items(job_data, stream, serializer=serializer)
+                self.assertEqual(
+                    dump(data, serializer=serializer),
+                    stream.getvalue()
+                )  # Test data copied for a worker, one item at a time, dumps the same
+
+    def test_hash_data(self):
+        """
+        Test the data hash is the hash of the pickle of the data, without memo.
+        """
+        import hashlib
+        import io
+        from docfx_yaml.serializer import hash_data, _copy_for_job
+
+        data = {
+            'items': [{'uid': 'a%d' % index, 'summary': 'x' * index} for index in range(2000)],
+            'references': [],
+        }
+        pickled = io.BytesIO()
+        pickler = pickle.Pickler(pickled, pickle.HIGHEST_PROTOCOL)
+        pickler.fast = True
+        pickler.dump((True, data))
+        self.assertEqual(
+            hashlib.sha1(pickled.getvalue()).hexdigest(),
+            hash_data(data, True)
+        )
+        self.assertNotEqual(
+            hash_data(data, True),
+            hash_data(data, False)
+        )
+
+        job_data = _copy_for_job(data)
+        data['items'][0]['uid'] = 'changed'
+        self.assertEqual(
+            'a0',
+            next(iter(job_data['items']))['uid']
+        )  # Test changes made after a job is created aren't written
+
+    def test_workers(self):
+        """
+        Test writing YAML files with worker processes gives the same output.
+        """
+        with sphinx_build('example'):
+            serial_output = read_output(self.build_path)
+            shutil.rmtree(self.build_path)
+
+            app = create_app({'docfx_yaml_workers': 2})
+            app.build(force_all=True)
+
+            self.assertEqual(
+                serial_output,
+                read_output(self.build_path)
+            )
+
+    def test_workers_queue(self):
+        """
+        Test worker processes get the files as they are written, with a bounded queue.
+        """
+        from docfx_yaml.serializer import YamlFileWriter, PYTHON
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            writer = YamlFileWriter(PYTHON, workers=2)
+            queued = []
+            for index in range(20):
+                writer.write(os.path.join(out_dir, '%d.yml' % index), {'items': [{'uid': index}]})
+                queued.append(len(writer.pending))
+            writer.close()
+
+            self.assertLessEqual(
+                max(queued),
+                4
+            )  # Test at most two jobs per worker are waiting
+            self.assertEqual(
+                20,
+                len(os.listdir(out_dir))
+            )
+            with open(os.path.join(out_dir, '19.yml')) as f:
+                self.assertEqual(
+                    {'items': [{'uid': 19}]},
+                    yaml.safe_load(f.read())
+                )
+
+    def test_workers_terminate(self):
+        """
+        Test terminating a writer stops its worker processes without waiting for the files.
+        """
+        from docfx_yaml.serializer import YamlFileWriter, PYTHON
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            writer = YamlFileWriter(PYTHON, workers=2)
+            for index in range(4):
+                writer.write(os.path.join(out_dir, '%d.yml' % index), {'items': [{'uid': index}]})
+            pool = writer.pool
+            writer.terminate()
+
+            self.assertIsNone(writer.pool)
+            self.assertFalse(writer.pending)
+            self.assertFalse(any(process.is_alive() for process in pool._pool))
+            writer.close()  # Test closing a terminated writer does nothing
+
+            writer = YamlFileWriter(PYTHON, workers=2)
+            writer.write(os.path.join(out_dir, 'error.yml'), {'items': [object()]})
+            self.assertRaises(ValueError, writer.close)
+            self.assertIsNone(writer.pool)
+            writer.terminate()  # Test terminating a closed writer does nothing
+
+    def test_workers_setting(self):
+        """
+        Test docfx_yaml_workers is checked to be a positive int.
+        """
+        from sphinx.errors import ExtensionError
+        from docfx_yaml.settings import resolve_settings
+
+        def config(workers):
+            return SimpleNamespace(
+                namespace_package_dict={},
+                source_prefix='',
+                remove_inheritance_for_notfound_class=False,
+                docfx_yaml_workers=workers,
+            )
+
+        self.assertEqual(
+            2,
+            resolve_settings(config(2)).workers
+        )
+        for workers in (None, '2', 0, True):
+            self.assertRaises(ExtensionError, resolve_settings, config(workers))
+
+    def test_release_data(self):
+        """
+        Test freeing the data of written files gives the same output,
+        and transient stores aren't pickled with the environment.
+        """
+        with sphinx_build('example'):
+            output = read_output(self.build_path)
+            shutil.rmtree(self.build_path)
+
+            app = create_app({'docfx_yaml_release_data': True})
+            app.build(force_all=True)
+
+            self.assertEqual(
+                output,
+                read_output(self.build_path)
+            )
+            for store in ('docfx_yaml_modules', 'docfx_yaml_classes', 'docfx_yaml_functions',
+                          'docfx_module_datams', 'docfx_module_children',
+                          'docfx_info_field_data'):
+                self.assertEqual(
+                    {},
+                    getattr(app.env, store)
+                )  # Test the data of written files is freed
+
+            self.assertEqual(
+                {},
+                app.env.docfx_doc_data
+            )  # Test the read data is freed too
+
+            with open('_build/.doctrees/environment.pickle', 'rb') as f:
+                env = pickle.load(f)
+            self.assertEqual(
+                {},
+                env.docfx_yaml_modules
+            )  # Test the stores are built after the environment is pickled
+            self.assertTrue(env.docfx_doc_data)  # Test the read data is kept for the next build
+
+    def test_item_model(self):
+        """
+        Test records are converted to the dicts of the YAML data.
+        """
+        from docfx_yaml.model import Item, Parameter, Source, to_data
+
+        item = Item(
+            uid='foo.bar',
+            name='bar',
+            source=Source(path='foo.py', branch='master', repo='repo', id='bar', start_line=1),
+            syntax_parameters=[Parameter(id='self'), Parameter(id='baz', default_value='None')],
+        )
+        self.assertEqual(
+            {
+                'uid': 'foo.bar',
+                'name': 'bar',
+                'langs': ['python'],
+                'source': {
+                    'remote': {'path': 'foo.py', 'branch': 'master', 'repo': 'repo'},
+                    'id': 'bar',
+                    'path': 'foo.py',
+                    'startLine': 1,
+                },
+                'syntax': {
+                    'parameters': [{'id': 'self'}, {'id': 'baz', 'defaultValue': 'None'}],
+                },
+            },
+            to_data(item)
+        )
+        self.assertEqual('foo.bar', item['uid'])
+        self.assertRaises(KeyError, lambda: item['summary'])  # Test unset fields aren't output
+
+        loaded = pickle.loads(pickle.dumps(item, pickle.HIGHEST_PROTOCOL))
+        self.assertIs(
+            item.source.repo,
+            loaded.source.repo
+        )  # Test strings are interned when unpickled
+
+    def test_signature_parser(self):
+        """
+        Test the signature parser finds the signatures of the regex.
+        """
+        from docfx_yaml.extension import enumerate_extract_signature, enumerate_cleaned_signature
+
+        docstrings = [
+            'foo(self: module.Foo, a: int = 1, b=None) -> None\n\nCall bar(x) or baz( *args , **kwargs ).',
+            'foo(a=(1,2), b=g(1)) and foo(,a) and foo() and foo(a=, b)',
+            'foo(' + ', '.join(['a'] * 21) + ') and foo(a:  , b)',
+        ]
+        for doc in docstrings:
+            signatures = []
+            for sig in enumerate_extract_signature(doc):
+                args = []
+                for i in range(20):
+                    if sig.group('p%d' % i) is None:
+                        break
+                    args.append(sig.group('p%d' % i) + (sig.group('d%d' % i) or ''))
+                signatures.append('{0}({1})'.format(sig.group('name'), ', '.join(args)))
+
+            self.assertEqual(
+                list(enumerate_cleaned_signature(doc)),
+                signatures
+            )
+
+    def test_extract_signature(self):
+        """
+        Test signatures are taken from the docstring when inspect can't get them.
+        """
+        from functools import partial
+        from docfx_yaml.extension import _extract_signature
+
+        def foo(a, b=1):
+            pass
+
+        invalid = partial(foo, 1, 2, 3)  # inspect.signature raises ValueError
+        invalid.__doc__ = 'bar(x, y=2) -> None'
+        signature, parameters = _extract_signature(invalid)
+        self.assertEqual(
+            str(signature),
+            '(x, y=2)'
+        )
+        self.assertEqual(
+            list(parameters),
+            ['x', 'y']
+        )
+
+        for doc in ('No signature.', 'bar(x) or baz(y)'):
+            invalid.__doc__ = doc
+            self.assertEqual(
+                _extract_signature(invalid),
+                (None, None)
+            )  # Test missing or ambiguous signatures are skipped
+
+    def test_references_unique(self):
+        """
+        Test references of every file have unique uids.
+        """
+        with sphinx_build('example'):
+            for content in read_output(self.build_path).values():
+                data = yaml.safe_load(content)
+                if not isinstance(data, dict):
+                    continue  # Skip toc.yml
+                uids = [ref['uid'] for ref in data.get('references', [])]
+
+                self.assertEqual(
+                    len(uids),
+                    len(set(uids))
+                )
+
+    def test_git_overrides(self):
+        """
+        Test git metadata can be set in the configuration.
+        """
+        with sphinx_build('example', {
+            'docfx_yaml_git_remote': 'https://github.com/example/example.git',
+            'docfx_yaml_git_branch': 'release',
+            'docfx_yaml_git_root': os.path.abspath('tests'),
+        }):
+            with open(os.path.join(self.build_path, self.yaml_files['class_files']['rst'][2])) as f:
+                data = yaml.safe_load(f)
+
+                self.assertEqual(
+                    data['items'][0]['source']['remote']['repo'],
+                    'https://github.com/example/example.git'
+                )
+
+                self.assertEqual(
+                    data['items'][0]['source']['remote']['branch'],
+                    'release'
+                )
+
+                self.assertIn(
+                    'format{sep}rst{sep}foo.py'.format(sep=os.sep),
+                    data['items'][0]['source']['path']
+                )
+
+    def test_git_metadata_changed(self):
+        """
+        Test documents are read again when the git metadata changes between builds.
+        """
+        def create_recording_app():
+            app = create_app()
+            app.docfx_test_read_docs = []
+            app.connect('env-before-read-docs',
+                        lambda app, env, docnames: app.docfx_test_read_docs.extend(docnames))
+            return app
+
+        with sphinx_build('example'):
+            app = create_recording_app()
+            app.env.docfx_remote = 'https://github.com/example/example.git'
+            app.env.docfx_branch = 'release'
+            app.build()
+
+            self.assertIn('format.rst', app.docfx_test_read_docs)
+
+            with open(os.path.join(self.build_path, self.yaml_files['class_files']['rst'][2])) as f:
+                data = yaml.safe_load(f)
+
+                self.assertEqual(
+                    data['items'][0]['source']['remote']['repo'],
+                    'https://github.com/example/example.git'
+                )
+
+                self.assertEqual(
+                    data['items'][0]['source']['remote']['branch'],
+                    'release'
+                )
+
+            app = create_recording_app()
+            app.build()
+
+            self.assertIn(
+                'format.rst',
+                app.docfx_test_read_docs
+            )  # Test metadata going back is a change too
+
+            app = create_recording_app()
+            app.build()
+
+            self.assertEqual(
+                app.docfx_test_read_docs,
+                []
+            )  # Test unchanged metadata reads nothing
+
+    def test_namespace_package_matcher(self):
+        """
+        Test namespace package patterns match as calling re.match with each of them in order.
+        """
+        from docfx_yaml.settings import NamespacePackageMatcher
+
+        package_names = ['abc', 'ab', 'xab', 'Foo', 'foo_bar', 'yy', 'xy', '']
+        for namespace_package_dict, combined in (
+            ({'a': 'first', 'ab': 'second', r'.?y': 'third'}, True),
+            ({'ab': 'second', 'a': 'first', 'x|foo': 'fourth'}, True),
+            ({'(x)y': 'group', 'a': 'first'}, False),
+            ({'(?i)foo': 'flags', 'a': 'first'}, False),
+        ):
+            matcher = NamespacePackageMatcher(namespace_package_dict)
+            self.assertEqual(
+                matcher.combined is not None,
+                combined
+            )  # Test patterns with groups or flags are matched one by one
+
+            for package_name in package_names:
+                expected = None
+                for name, friendly_name in namespace_package_dict.items():
+                    if re.match(name, package_name) is not None:
+                        expected = friendly_name
+                        break
+
+                self.assertEqual(
+                    matcher.match(package_name),
+                    expected
+                )
+
+            self.assertEqual(
+                set(matcher.cache),
+                set(package_names)
+            )  # Test the result of each package name is kept, matching or not
+
+            matcher.cache['abc'] = 'cached'
+            self.assertEqual(
+                matcher.match('abc'),
+                'cached'
+            )
+
+    def test_source_settings(self):
+        """
+        Test source paths use namespace_package_dict and source_prefix.
+        """
+        with sphinx_build('example', {
+            'docfx_yaml_git_remote': 'https://github.com/example/example.git',
+            'docfx_yaml_git_branch': 'master',
+            'docfx_yaml_git_root': os.path.abspath('tests/example'),
+            'namespace_package_dict': {r'\.?format': 'friendly_format'},
+            'source_prefix': 'prefix/',
+        }):
+            with open(os.path.join(self.build_path, self.yaml_files['class_files']['rst'][2])) as f:
+                data = yaml.safe_load(f)
+
+                self.assertEqual(
+                    data['items'][0]['source']['path'],
+                    'prefix/friendly_format{sep}rst{sep}foo.py'.format(sep=os.sep)
+                )
+
+    def test_fast_translator_corpus(self):
+        """
+        Test FastTranslator renders the documents of the example fragments like MarkdownTranslator.
+        """
+        from docfx_yaml.writer import MarkdownWriter, MarkdownTranslator, FastTranslator
+
+        documents = []
+        translate_document = MarkdownWriter.translate_document
+
+        def recording_translate_document(writer, document):
+            documents.append(document.deepcopy())
+            return translate_document(writer, document)
+
+        with sphinx_build('example'):
+            # Read all the documents again, force_all only writes them all
+            shutil.rmtree('_build/.doctrees')
+            MarkdownWriter.translate_document = recording_translate_document
+            try:
+                app = create_app()
+                read_docs = []
+                app.connect('env-before-read-docs',
+                            lambda app, env, docnames: read_docs.extend(docnames))
+                app.build(force_all=True)
+            finally:
+                MarkdownWriter.translate_document = translate_document
+
+            self.assertEqual(
+                sorted(app.env.found_docs),
+                sorted(read_docs)
+            )  # Test the fragments of every document of the example are compared
+            fast_translator = FastTranslator(app.builder)
+            translated = 0
+            for document in documents:
+                fast_document = document.deepcopy()
+                output = fast_translator.translate(fast_document)
+                if output is None:
+                    self.assertEqual(
+                        document.pformat(),
+                        fast_document.pformat()
+                    )  # Test documents left to MarkdownTranslator are unchanged
+                    continue
+                translated += 1
+
+                translator = MarkdownTranslator(document, app.builder)
+                translator.walkabout(document)
+                self.assertEqual(
+                    translator.body,
+                    output
+                )
+                self.assertEqual(
+                    document.pformat(),
+                    fast_document.pformat()
+                )  # Test references are resolved the same way
+
+            self.assertTrue(translated)
+            self.assertLess(
+                translated,
+                len(documents)
+            )  # Test documents out of the subset fall back to MarkdownTranslator
+
+    def test_source_lines(self):
+        """
+        Test start lines of classes sharing a name are the lines inspect.getsourcelines gives.
+        """
+        import importlib
+        import inspect
+        from docfx_yaml.source import SourceLines, CLASSES_BY_QUALNAME
+
+        source = '\n'.join([
+            'class A(object):',
+            '    class Config(object):',
+            '        pass',
+            '',
+            'def decorate(cls):',
+            '    return cls',
+            '',
+            'class B(object):',
+            '    @decorate',
+            '    class Config(object):',
+            '        pass',
+            '',
+            'def make():',
+            '    class Config(object):',
+            '        pass',
+            '    return Config',
+            '',
+            'class Config(object):',
+            '    pass',
+            '',
+        ])
+        module_dir = tempfile.mkdtemp()
+        sys.path.insert(0, module_dir)
+        try:
+            with open(os.path.join(module_dir, 'docfx_source_lines.py'), 'w') as f:
+                f.write(source)
+            module = importlib.import_module('docfx_source_lines')
+            source_lines = SourceLines()
+
+            for cls, start_line in (
+                (module.A.Config, 2),
+                (module.B.Config, 9),
+                (module.make(), 14),
+                (module.Config, 18),
+                (module.B, 8),
+            ):
+                self.assertEqual(
+                    source_lines.start_line(cls),
+                    inspect.getsourcelines(cls)[1]
+                )
+                if CLASSES_BY_QUALNAME:
+                    self.assertEqual(
+                        source_lines.start_line(cls),
+                        start_line
+                    )  # Test classes are found by qualified name, before Python 3.9 by name
+        finally:
+            sys.path.remove(module_dir)
+            sys.modules.pop('docfx_source_lines', None)
+            shutil.rmtree(module_dir)
+
+
+def create_builder():
+    """ Make a stand-in for the Sphinx builder used by the writer, without building anything.
+    """
+    return SimpleNamespace(
+        config=SimpleNamespace(text_newlines='unix', text_sectionchars='*=-~"+`'),
+        confdir='.',
+        env=SimpleNamespace(docname='test'),
+        warn=lambda *args, **kwargs: None,
+    )
+
+
+def random_rst(rng, depth=0):
+    """ Make the lines of a random reStructuredText document of nested blocks.
+    """
+    def words():
+        text = ' '.join(rng.choice(['alpha', 'beta', 'gamma', '*em*', '``code``', 'x' * 30])
+                        for _ in range(rng.randrange(1, 6)))
+        return text
+
+    def nested(indent):
+        if depth >= 2:
+            return [indent + words()]
+        return [indent + line if line else '' for line in random_rst(rng, depth + 1)]
+
+    lines = []
+    for _ in range(rng.randrange(1, 3)):
+        kind = rng.choice(['paragraph', 'bullet', 'enumerated', 'definition', 'field',
+                           'admonition', 'footnote', 'literal', 'table'])
+        if kind == 'paragraph' or depth >= 2:
+            lines.append(words())
+        elif kind == 'bullet':
+            for _ in range(rng.randrange(1, 3)):
+                item = nested('  ')
+                lines += ['* ' + item[0][2:]] + item[1:] + ['']
+        elif kind == 'enumerated':
+            for index in range(rng.randrange(1, 3)):
+                item = nested('   ')
+                lines += ['%d. ' % (index + 1) + item[0][3:]] + item[1:] + ['']
+        elif kind == 'definition':
+            for _ in range(rng.randrange(1, 3)):
+                term = rng.choice(['term', 'name', 'value'])
+                term += ''.join(' : ' + rng.choice(['int', 'str']) for _ in range(rng.randrange(3)))
+                lines += [term] + nested('    ') + ['']
+        elif kind == 'field':
+            for _ in range(rng.randrange(1, 3)):
+                lines += [':%s:' % rng.choice(['param', 'returns', 'note'])] + nested('    ') + ['']
+        elif kind == 'admonition':
+            lines += ['.. %s::' % rng.choice(['note', 'warning', 'tip']), ''] + nested('   ')
+        elif kind == 'footnote':
+            lines += [words() + ' [#]_', '', '.. [#] ' + words(), ''] + nested('   ')
+        elif kind == 'literal':
+            lines += [words() + '::', ''] + ['    ' + words() for _ in range(rng.randrange(1, 3))]
+        else:
+            lines += ['.. list-table::', '']
+            for _ in range(rng.randrange(1, 3)):
+                lines += ['   * - ' + words(), '     - ' + words()]
+        lines.append('')
+    return lines
+
+
+class WriterTests(unittest.TestCase):
+    """ Tests of the markdown writer on documents parsed by docutils, without a Sphinx build.
+    """
+    random_documents = None  #: Documents of random_rst, parsed once for the tests using them.
+
+    def setUp(self):
+        self.builder = create_builder()
+
+    @staticmethod
+    def parse(text, settings=None):
+        from docutils.core import publish_doctree
+
+        if settings is not None:
+            return publish_doctree(text, settings=settings)
+        return publish_doctree(text, settings_overrides={
+            'report_level': 5,
+            'docinfo_xform': False,
+        })
+
+    @classmethod
+    def get_random_documents(cls):
+        """ Get 2,000 random documents, copy them before translating as translators change them.
+        """
+        import random
+
+        if cls.random_documents is None:
+            rng = random.Random(0)
+            settings = cls.parse('').settings
+            cls.random_documents = [
+                cls.parse('\n'.join(random_rst(rng)), settings) for _ in range(2000)
+            ]
+        return cls.random_documents
+
+    def translate(self, document, translator_class=None):
+        from docfx_yaml.writer import MarkdownTranslator
+
+        translator = (translator_class or MarkdownTranslator)(document, self.builder)
+        document.walkabout(translator)
+        self.assertEqual(
+            [0],
+            translator.stateindent
+        )  # Test every state is ended
+        return translator.body
+
+    def test_nested_classifiers(self):
+        """
+        Test a classified term holding another classified definition list is output.
+        """
+        document = self.parse(
+            'Intro.\n\nouter : int\n    Description.\n\n'
+            '    inner : str\n        Inner description.\n'
+        )
+        self.assertEqual(
+            self.translate(document),
+            'Intro.\n\nouter : int\n   Description.\n\n   inner : str\n      Inner description.\n'
+        )
+
+        document = self.parse('plain\n    inner : str\n        Inner description.\n')
+        self.assertEqual(
+            self.translate(document),
+            'plain\n   inner : str\n      Inner description.\n'
+        )  # Test a term without classifier holding a classified one
+
+    def test_classifier_count_unchanged(self):
+        """
+        Test counting the classifiers of a term only changes the output of nested classified terms.
+        """
+        from docutils import nodes
+        from docfx_yaml.writer import MarkdownTranslator
+
+        class NestedCountTranslator(MarkdownTranslator):
+            # The count used before, including the classifiers of nested definition lists
+            def visit_definition_list_item(self, node):
+                self._classifier_count_in_li = len(node.traverse(nodes.classifier))
+
+        nested_count = 0
+        for document in self.get_random_documents():
+            output = self.translate(document.deepcopy())
+
+            items = document.traverse(nodes.definition_list_item)
+            if any(len(item.traverse(nodes.classifier)) !=
+                   sum(isinstance(child, nodes.classifier) for child in item.children)
+                   for item in items):
+                nested_count += 1
+                self.assertTrue(output)
+                continue
+
+            document = document.deepcopy()
+            translator = NestedCountTranslator(document, self.builder)
+            document.walkabout(translator)
+            self.assertEqual(
+                translator.body,
+                output
+            )
+
+        self.assertTrue(nested_count)  # Test nested classifiers were generated
+
+    def test_walkabout(self):
+        """
+        Test MarkdownTranslator.walkabout translates as docutils' recursive walkabout does.
+        """
+        from docfx_yaml.writer import MarkdownTranslator
+
+        for document in self.get_random_documents()[:200]:
+            document = document.deepcopy()
+            translator = MarkdownTranslator(document, self.builder)
+            translator.walkabout(document)
+            self.assertEqual(
+                translator.body,
+                self.translate(document.deepcopy())
+            )
+
+    def test_walkabout_exceptions(self):
+        """
+        Test MarkdownTranslator.walkabout handles the exceptions of visitors as docutils does.
+        """
+        import random
+        from docutils import nodes
+        from docfx_yaml.writer import MarkdownTranslator
+
+        class RaisingTranslator(MarkdownTranslator):
+            # Raise exceptions from the visitors of some nodes and record the visitors called
+            def __init__(self, document, builder, raising):
+                self.raising = raising
+                self.positions = {id(node): index for index, node in enumerate(document.traverse())}
+                self.calls = []
+                MarkdownTranslator.__init__(self, document, builder)
+
+            def dispatch(self, kind, method, node):
+                position = self.positions.get(id(node))
+                self.calls.append((kind, position))
+                method(node)
+                if (kind, position) in self.raising:
+                    raise self.raising[kind, position]('raised')
+
+            def dispatch_visit(self, node):
+                self.dispatch('visit', MarkdownTranslator.dispatch_visit.__get__(self), node)
+
+            def dispatch_departure(self, node):
+                self.dispatch('depart', MarkdownTranslator.dispatch_departure.__get__(self), node)
+
+        def walk(document, raising, walkabout):
+            translator = RaisingTranslator(document, self.builder, raising)
+            try:
+                result = walkabout(translator, document)
+            except Exception as e:
+                result = type(e)
+            return translator.calls, result
+
+        rng = random.Random(0)
+        exceptions = [nodes.SkipNode, nodes.SkipChildren, nodes.SkipDeparture, nodes.SkipSiblings,
+                      nodes.StopTraversal, ValueError]
+        documents = self.get_random_documents()[:100]
+        results = set()
+        for _ in range(3000):
+            document = rng.choice(documents)
+            count = len(document.traverse())
+            raising = {
+                (rng.choice(['visit', 'depart']), rng.randrange(count)): rng.choice(exceptions)
+                for _ in range(rng.randrange(1, 4))
+            }
+            expected = walk(document.deepcopy(), raising, lambda translator, document:
+                            document.walkabout(translator))
+            self.assertEqual(
+                walk(document.deepcopy(), raising, MarkdownTranslator.walkabout),
+                expected
+            )
+            results.add(expected[1])
+
+        self.assertLessEqual(
+            {False, True, nodes.SkipNode, nodes.SkipChildren, nodes.SkipDeparture,
+             nodes.SkipSiblings, nodes.StopTraversal, ValueError},
+            results
+        )  # Test the walks ended, stopped, and raised every exception
+
+    def test_text_width(self):
+        """
+        Test text widths are the same as docutils' column_width.
+        """
+        from docutils.utils import column_width
+        from docfx_yaml.writer import text_width, TextWrapper
+
+        for text in ('client', '客户端 client', 'ＡＢＣ（既定值）', 'cafe\u0301', ''):
+            self.assertEqual(
+                column_width(text),
+                text_width(text)
+            )
+        self.assertEqual(
+            ['客户端凭', '据', 'client ', 'credent', 'ial'],
+            TextWrapper(width=8).wrap('客户端凭据 client credential')
+        )  # Test wide characters are split one by one, and long words broken
+
+    def test_alert_box_unchanged(self):
+        """
+        Test alert boxes don't change the references in their nodes.
+        """
+        from docfx_yaml.writer import MarkdownWriter
+
+        document = self.parse('Intro.\n\n.. note::\n\n   See `Foo <foo.html#format.rst.foo.Foo>`_.\n')
+        tree = document.pformat()
+        writer = MarkdownWriter(self.builder)
+
+        self.assertEqual(
+            writer.translate_document(document),
+            'Intro.\n\n\n> [!NOTE]\n> See <xref:format.rst.foo.Foo>.\n>\n'
+        )
+        self.assertEqual(
+            tree,
+            document.pformat()
+        )
+        self.assertEqual(
+            writer.translate_document(document),
+            'Intro.\n\n\n> [!NOTE]\n> See <xref:format.rst.foo.Foo>.\n>\n'
+        )  # Test the same node is rendered again the same way
+
+    def test_fast_translator(self):
+        """
+        Test FastTranslator renders documents like MarkdownTranslator, or leaves them to it.
+        """
+        from docutils import nodes
+        from sphinx import addnodes
+        from docfx_yaml.writer import MarkdownTranslator, FastTranslator
+
+        documents = [self.parse(text) for text in (
+            'Docstring of *class* with ``code``,\n**strong** and `Foo <foo.html#format.rst.foo.Foo>`__.\n\n'
+            'Second paragraph, see `Python <https://www.python.org>`__.\n',
+            '* First item.\n* Second item,\n  on two lines.\n\n  Second paragraph.\n',
+            'Steps:\n\n1. First.\n2. Second.\n',
+        )]
+        document = self.parse('Links to')
+        document[0] += [
+            addnodes.pending_xref('', nodes.literal('', 'Foo'), refdomain='py',
+                                  reftarget='format.rst.foo.Foo'),
+            addnodes.pending_xref('', nodes.Text('bar'), refdomain='std', reftarget='bar'),
+            nodes.inline('', 'term', classes=['xref']),
+            nodes.inline('', 'text'),
+        ]
+        documents.append(document)
+        summary_count = len(documents)
+        documents += self.get_random_documents()[:200]
+
+        fast_translator = FastTranslator(self.builder)
+        translated = []
+        for index, document in enumerate(documents):
+            document = document.deepcopy()
+            fast_document = document.deepcopy()
+            output = fast_translator.translate(fast_document)
+            if output is None:
+                self.assertEqual(
+                    document.pformat(),
+                    fast_document.pformat()
+                )  # Test documents left to MarkdownTranslator are unchanged
+                continue
+            translated.append(index)
+
+            translator = MarkdownTranslator(document, self.builder)
+            translator.walkabout(document)
+            self.assertEqual(
+                translator.body,
+                output
+            )
+            self.assertEqual(
+                document.pformat(),
+                fast_document.pformat()
+            )  # Test references are resolved the same way
+
+        self.assertEqual(
+            list(range(summary_count)),
+            translated[:summary_count]
+        )  # Test the summaries are all rendered by FastTranslator
+        self.assertLess(
+            len(translated),
+            len(documents)
+        )  # Test documents out of the subset fall back to MarkdownTranslator